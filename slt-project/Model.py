@@ -8,14 +8,38 @@ from tensorflow.keras.layers import (
 )
 from sklearn.model_selection import train_test_split
 import sys
+import argparse
+import landmark_store
+import export_model
+from training_pipeline import make_dataset, ThroughputCallback, INPUT_PIPELINES, BATCH_SIZE, SHUFFLE_BUFFER
+from augmentation import LandmarkAugmenter, AugmentationReport
 
 # Configure standard output to use UTF-8 encoding
 sys.stdout.reconfigure(encoding='utf-8')
 sys.stderr.reconfigure(encoding='utf-8')
 
+# Training options; with no arguments (as datacollection.py runs it) this trains as before
+parser = argparse.ArgumentParser(description='Train the gesture recognition model.')
+parser.add_argument('--input-pipeline', choices=INPUT_PIPELINES,
+                    default=os.environ.get('SLT_INPUT_PIPELINE', 'numpy'),
+                    help="'numpy' fits on in-memory arrays, 'tfdata' streams batches from the packed shard")
+parser.add_argument('--batch-size', type=int, default=int(os.environ.get('SLT_BATCH_SIZE', BATCH_SIZE)))
+parser.add_argument('--shuffle-buffer', type=int, default=int(os.environ.get('SLT_SHUFFLE_BUFFER', SHUFFLE_BUFFER)),
+                    help='Shuffle buffer size for the tfdata pipeline')
+parser.add_argument('--augment', action='store_true', default=os.environ.get('SLT_AUGMENT', '0') == '1',
+                    help='Augment training batches on the fly (uses the tfdata pipeline)')
+args = parser.parse_args()
+if args.augment and args.input_pipeline != 'tfdata':
+    print("Augmentation runs inside the tf.data pipeline; using --input-pipeline tfdata.")
+    args.input_pipeline = 'tfdata'
+augmenter = LandmarkAugmenter() if args.augment else None
+
 # Set the path where the dataset is stored
 DATA_PATH = os.path.join('MP_Data')
 
+# Set the path where the packed dataset shard is stored
+PACKED_PATH = landmark_store.PACKED_PATH
+
 # Get the list of gestures (classes)
 gestures = np.array([
     gesture for gesture in os.listdir(DATA_PATH)
@@ -30,25 +54,11 @@ sequence_length = 15
 num_landmarks_per_hand = 21 * 3
 num_landmarks = num_landmarks_per_hand * 2  # For both hands
 
-# Load the dataset
+# Load the dataset from the packed, memory-mapped shard
 def load_data():
-    X, y = [], []
-    for idx, gesture in enumerate(gestures):
-        gesture_path = os.path.join(DATA_PATH, gesture)
-        for sequence in os.listdir(gesture_path):
-            sequence_path = os.path.join(gesture_path, sequence, 'landmarks.npy')
-            if os.path.exists(sequence_path):
-                # Load and preprocess the landmark sequence
-                landmarks_sequence = np.load(sequence_path)
-                # Ensure the sequence has the correct length
-                if landmarks_sequence.shape[0] == sequence_length:
-                    X.append(landmarks_sequence)
-                    y.append(idx)
-                else:
-                    print(f"Sequence length mismatch in {sequence_path}")
-            else:
-                print(f"File not found: {sequence_path}")
-    return np.array(X), np.array(y)
+    # Bring the shard up to date, reading only new or changed sequence files
+    landmark_store.sync_dataset(DATA_PATH, PACKED_PATH, sequence_length, num_landmarks)
+    return landmark_store.load_labeled(gestures, PACKED_PATH)
 
 # Load the data
 X, y = load_data()
@@ -57,10 +67,24 @@ print(f"Data loaded: {X.shape[0]} sequences with {sequence_length} frames each."
 # Reshape data
 X = X.reshape(-1, sequence_length, num_landmarks)
 
-# Split the data into training and validation sets
-X_train, X_val, y_train, y_val = train_test_split(
-    X, y, test_size=0.1, random_state=42, stratify=y
+# Split the data into training and validation sets (same split as splitting X and y directly)
+train_idx, val_idx = train_test_split(
+    np.arange(len(y)), test_size=0.1, random_state=42, stratify=y
 )
+y_train, y_val = y[train_idx], y[val_idx]
+X_val = np.asarray(X[val_idx], dtype=np.float32)  # Small; also used to evaluate the exports
+if args.input_pipeline == 'numpy':
+    X_train = np.asarray(X[train_idx], dtype=np.float32)
+    X_calibration = X_train
+else:
+    # Training batches are read from the shard as needed; only int8 calibration rows are copied
+    train_ds = make_dataset(X, train_idx, y_train, args.batch_size, shuffle=True,
+                            shuffle_buffer=args.shuffle_buffer, preprocess=augmenter, seed=42)
+    val_ds = make_dataset(X, val_idx, y_val, args.batch_size, cache=True)
+    X_calibration = np.asarray(X[np.sort(train_idx[:export_model.NUM_CALIBRATION_SAMPLES])], dtype=np.float32)
+print(f"Input pipeline: {args.input_pipeline}, batch size {args.batch_size}, "
+      f"{len(train_idx)} training / {len(val_idx)} validation sequences"
+      f"{', augmented' if augmenter else ''}.")
 
 # Build the Transformer model with spatial feature extraction
 def build_transformer_model():
@@ -116,23 +140,43 @@ model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=1e-4),
 model.summary()
 
 # Define callbacks (optional)
+throughput = ThroughputCallback(len(train_idx))
 callbacks = [
+    throughput,
     tf.keras.callbacks.ReduceLROnPlateau(
         monitor='val_loss', factor=0.5, patience=3, min_lr=1e-6, verbose=1),
     tf.keras.callbacks.EarlyStopping(
         monitor='val_loss', patience=5, restore_best_weights=True, verbose=1)
 ]
+if augmenter is not None:
+    callbacks.insert(1, AugmentationReport(augmenter))
 
 # Train the model with adjusted verbosity
-history = model.fit(
-    X_train, y_train,
-    validation_data=(X_val, y_val),
-    epochs=50,
-    batch_size=16,
-    callbacks=callbacks,
-    verbose=2
-)
+if args.input_pipeline == 'numpy':
+    history = model.fit(
+        X_train, y_train,
+        validation_data=(X_val, y_val),
+        epochs=50,
+        batch_size=args.batch_size,
+        callbacks=callbacks,
+        verbose=2
+    )
+else:
+    history = model.fit(
+        train_ds,
+        validation_data=val_ds,
+        epochs=50,
+        callbacks=callbacks,
+        verbose=2
+    )
+print(f"Training throughput: {throughput.summary()}")
+if augmenter is not None:
+    print(f"Augmentation: {augmenter.summary()}")
 
 # Save the trained model
 model.save('gesture_recognition_model.keras')  # Saves in Keras format
 print("Model saved as 'gesture_recognition_model.keras'")
+
+# Export TFLite/ONNX artifacts (float32, float16, int8) and compare them with the Keras model
+export_model.export_all(model, X_calibration, X_val, y_val, export_model.EXPORT_PATH,
+                        sequence_length, num_landmarks)
@@ -1,11 +1,23 @@
 # app.py
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, g
 from flask_cors import CORS
 import numpy as np
-import tensorflow as tf
 import os
 import sys
+import threading
+import time
+from batching import MicroBatcher
+import wire_format
+from inference import load_runner
+from streaming import SessionManager
+from metrics import StageTimers, prometheus_summary, prometheus_histogram, prometheus_value
+
+# Streaming sessions need Flask-SocketIO; the HTTP endpoints work without it
+try:
+    from flask_socketio import SocketIO, emit, disconnect
+except ImportError:
+    SocketIO = None
 
 app = Flask(__name__)
 CORS(app)
@@ -18,7 +30,8 @@ CORS(app)
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
 # Define the path to the trained model (assuming it's in the same directory)
-model_path = os.path.join(script_dir, 'gesture_recognition_model.keras')
+# Set SLT_MODEL to a .tflite or .onnx export to serve it without loading full TensorFlow
+model_path = os.environ.get('SLT_MODEL', os.path.join(script_dir, 'gesture_recognition_model.keras'))
 
 # Define the path to the gestures dataset (assuming it's a subdirectory named 'MP_Data')
 data_path = os.path.join(script_dir, 'MP_Data')
@@ -32,10 +45,10 @@ if not os.path.exists(model_path):
     print(f"Error: Trained model file not found at {model_path}")
     sys.exit(1)
 
-# Load the trained model
+# Load the trained model behind a compiled, warmed-up inference runner
 try:
-    model = tf.keras.models.load_model(model_path, compile=False)
-    print("Model loaded successfully.")
+    runner = load_runner(model_path)
+    print(f"Model loaded successfully ({runner.backend} backend).")
 except Exception as e:
     print(f"An error occurred while loading the model: {e}")
     sys.exit(1)
@@ -70,33 +83,75 @@ sequence_length = 15  # Ensure this matches your training sequence length
 num_landmarks_per_hand = 21 * 3  # 21 landmarks * 3 coordinates
 num_landmarks = num_landmarks_per_hand * 2  # For both hands
 
+# ============================
+# === Micro-Batching Configuration
+# ============================
+
+# Concurrent /predict requests are collected for up to BATCH_WINDOW_MS (or until
+# BATCH_MAX_SIZE requests are waiting) and scored in a single forward pass
+BATCH_WINDOW_MS = float(os.environ.get('SLT_BATCH_WINDOW_MS', 3.0))
+BATCH_MAX_SIZE = int(os.environ.get('SLT_BATCH_MAX_SIZE', 32))
+
+# Maximum number of sequences scored per forward pass by /predict_batch
+PREDICT_BATCH_CHUNK_SIZE = int(os.environ.get('SLT_PREDICT_BATCH_CHUNK_SIZE', 64))
+
+# Warm the runner up at the largest batch the micro-batcher will send
+runner.warmup((BATCH_MAX_SIZE,))
+
+batcher = MicroBatcher(
+    runner.predict,
+    max_batch_size=BATCH_MAX_SIZE,
+    max_wait_ms=BATCH_WINDOW_MS
+)
+
+# Function to build a binary response of (gesture index, confidence) records
+def binary_response(prediction_indices, confidences, num_errors=0):
+    response = Response(
+        wire_format.encode_predictions(prediction_indices, confidences),
+        mimetype=wire_format.OCTET_STREAM_MIMETYPE
+    )
+    response.headers['X-Count'] = str(len(prediction_indices))
+    response.headers['X-Errors'] = str(num_errors)
+    return response
+
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
-        data = request.get_json(force=True)
-        sequence = data.get('sequence', None)
+        expected_shape = (sequence_length, num_landmarks)
 
-        if sequence is None:
-            return jsonify({'error': 'No sequence data provided.'}), 400
+        if wire_format.is_binary(request.mimetype):
+            # Decode octet-stream / .npy bodies straight into the model input
+            try:
+                input_data = wire_format.decode_landmarks(
+                    request.get_data(cache=False), request.mimetype, request.headers, expected_shape)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            if input_data.shape == (1,) + expected_shape:
+                input_data = input_data[0]
+        else:
+            data = request.get_json(force=True)
+            sequence = data.get('sequence', None)
+
+            if sequence is None:
+                return jsonify({'error': 'No sequence data provided.'}), 400
 
-        # Convert the sequence to a numpy array
-        input_data = np.array(sequence, dtype=np.float32)
+            # Convert the sequence to a numpy array
+            input_data = np.array(sequence, dtype=np.float32)
 
         # Ensure the input has the correct shape
-        expected_shape = (sequence_length, num_landmarks)
         if input_data.shape != expected_shape:
             return jsonify({
                 'error': f'Invalid input shape. Expected {expected_shape} but got {input_data.shape}'
             }), 400
 
-        # Reshape the input for the model: (1, sequence_length, num_landmarks)
-        input_data = input_data.reshape(1, sequence_length, num_landmarks)
-
-        # Make prediction
-        probabilities = model.predict(input_data, verbose=0)[0]
+        # Make prediction (batched together with any concurrent requests)
+        probabilities = batcher.predict(input_data)
         prediction_index = np.argmax(probabilities)
         confidence = float(probabilities[prediction_index])
 
+        if wire_format.wants_binary(request.accept_mimetypes):
+            return binary_response([prediction_index], [confidence])
+
         # Retrieve the gesture label
         gesture_label = gestures[prediction_index]
 
@@ -113,6 +168,268 @@ def predict():
         print(f"Exception during prediction: {e}")
         return jsonify({'error': str(e)}), 500
 
+# Function to validate a list of sequences, returning the stacked valid ones and per-entry errors
+def validate_sequences(sequences):
+    expected_shape = (sequence_length, num_landmarks)
+
+    # Fast path: the whole payload converts to a single (N, sequence_length, num_landmarks) array
+    try:
+        stacked = np.array(sequences, dtype=np.float32)
+        if stacked.ndim == 3 and stacked.shape[1:] == expected_shape:
+            return stacked, np.arange(len(sequences)), {}
+    except (ValueError, TypeError):
+        pass
+
+    # Slow path: check each entry so malformed ones do not fail the whole batch
+    valid, valid_indices, errors = [], [], {}
+    for idx, sequence in enumerate(sequences):
+        if sequence is None:
+            errors[idx] = 'No sequence data provided.'
+            continue
+        try:
+            input_data = np.array(sequence, dtype=np.float32)
+        except (ValueError, TypeError) as e:
+            errors[idx] = str(e)
+            continue
+        if input_data.shape != expected_shape:
+            errors[idx] = f'Invalid input shape. Expected {expected_shape} but got {input_data.shape}'
+            continue
+        valid.append(input_data)
+        valid_indices.append(idx)
+
+    if valid:
+        stacked = np.stack(valid)
+    else:
+        stacked = np.empty((0,) + expected_shape, dtype=np.float32)
+    return stacked, np.array(valid_indices, dtype=int), errors
+
+# Function to score stacked sequences in chunked batches, returning all class probabilities
+def score_sequences(stacked):
+    probabilities = np.empty((len(stacked), len(gestures)), dtype=np.float32)
+    for start in range(0, len(stacked), PREDICT_BATCH_CHUNK_SIZE):
+        chunk = stacked[start:start + PREDICT_BATCH_CHUNK_SIZE]
+        probabilities[start:start + len(chunk)] = runner.predict(chunk)
+    return probabilities
+
+# Function to turn class probabilities into per-sequence JSON results
+def format_results(probabilities, top_k=0):
+    prediction_indices = np.argmax(probabilities, axis=1)
+    confidences = probabilities[np.arange(len(probabilities)), prediction_indices]
+    if top_k:
+        top_indices = np.argsort(-probabilities, axis=1)[:, :top_k]
+
+    results = []
+    for row, prediction_index in enumerate(prediction_indices):
+        result = {
+            'gesture': str(gestures[prediction_index]),
+            'confidence': float(confidences[row])
+        }
+        if top_k:
+            result['top_k'] = [
+                {'gesture': str(gestures[idx]), 'confidence': float(probabilities[row, idx])}
+                for idx in top_indices[row]
+            ]
+        results.append(result)
+    return results
+
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    try:
+        expected_shape = (sequence_length, num_landmarks)
+
+        if wire_format.is_binary(request.mimetype):
+            # A binary body is one (N, sequence_length, num_landmarks) block, so it is valid or not as a whole
+            try:
+                stacked = wire_format.decode_landmarks(
+                    request.get_data(cache=False), request.mimetype, request.headers, expected_shape)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            if stacked.ndim != 3 or stacked.shape[1:] != expected_shape:
+                return jsonify({
+                    'error': f'Invalid input shape. Expected (N, {sequence_length}, {num_landmarks}) '
+                             f'but got {stacked.shape}'
+                }), 400
+            num_sequences = len(stacked)
+            valid_indices, errors = np.arange(num_sequences), {}
+            top_k_value = request.args.get('top_k', 0)
+        else:
+            data = request.get_json(force=True)
+            sequences = data.get('sequences', None)
+
+            if not isinstance(sequences, list):
+                return jsonify({'error': 'No sequence data provided.'}), 400
+
+            # Validate every entry so only the valid ones are scored
+            stacked, valid_indices, errors = validate_sequences(sequences)
+            num_sequences = len(sequences)
+            top_k_value = data.get('top_k', 0)
+
+        try:
+            top_k = min(max(int(top_k_value), 0), len(gestures))
+        except (ValueError, TypeError):
+            return jsonify({'error': 'top_k must be an integer.'}), 400
+
+        probabilities = score_sequences(stacked)
+
+        if wire_format.wants_binary(request.accept_mimetypes):
+            # Entries that failed validation are sent as index -1 with a NaN confidence
+            prediction_indices = np.full(num_sequences, -1, dtype=np.int32)
+            confidences = np.full(num_sequences, np.nan, dtype=np.float32)
+            prediction_indices[valid_indices] = np.argmax(probabilities, axis=1)
+            confidences[valid_indices] = np.max(probabilities, axis=1)
+            return binary_response(prediction_indices, confidences, len(errors))
+
+        # Put results and per-entry errors back in request order
+        results = [None] * num_sequences
+        for idx, result in zip(valid_indices, format_results(probabilities, top_k)):
+            results[idx] = result
+        for idx, error in errors.items():
+            results[idx] = {'error': error}
+
+        return jsonify({
+            'results': results,
+            'count': num_sequences,
+            'errors': len(errors)
+        })
+
+    except Exception as e:
+        # Log the exception details
+        print(f"Exception during batch prediction: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/gestures', methods=['GET'])
+def list_gestures():
+    # Gesture labels in model output order (binary responses carry indices into this list)
+    return jsonify({'gestures': [str(gesture) for gesture in gestures]})
+
+# ============================
+# === Streaming Sessions (socket.io)
+# ============================
+
+# Clients send one frame of num_landmarks floats at a time over socket.io; the server keeps
+# a per-session ring buffer and emits a 'prediction' event whenever a window completes
+STREAM_STRIDE = int(os.environ.get('SLT_STREAM_STRIDE', sequence_length))
+STREAM_MAX_SESSIONS = int(os.environ.get('SLT_STREAM_MAX_SESSIONS', 256))
+STREAM_IDLE_TIMEOUT_S = float(os.environ.get('SLT_STREAM_IDLE_TIMEOUT_S', 60.0))
+
+sessions = SessionManager(
+    sequence_length, num_landmarks, stride=STREAM_STRIDE,
+    max_sessions=STREAM_MAX_SESSIONS, idle_timeout=STREAM_IDLE_TIMEOUT_S
+)
+
+if SocketIO is not None:
+    # Handle each client's events inline, in arrival order. With async handlers, two 'frame'
+    # events from one client can run on separate threads and interleave inside
+    # StreamSession.push, reordering or corrupting that session's window. Other clients still
+    # run in parallel, and a client waiting on the batcher just stops reading frames meanwhile
+    socketio = SocketIO(app, cors_allowed_origins='*', async_mode='threading', async_handlers=False)
+
+    @socketio.on('connect')
+    def stream_connect():
+        if sessions.open(request.sid) is None:
+            print(f"Rejected streaming session {request.sid}: {len(sessions)} sessions open")
+            return False
+
+    @socketio.on('disconnect')
+    def stream_disconnect():
+        sessions.close(request.sid)
+
+    @socketio.on('reset')
+    def stream_reset():
+        session = sessions.get(request.sid)
+        if session is not None:
+            session.reset()
+
+    @socketio.on('frame')
+    def stream_frame(data):
+        session = sessions.get(request.sid)
+        if session is None:
+            emit('error', {'error': 'Session expired. Reconnect to continue streaming.'})
+            disconnect()
+            return
+
+        try:
+            window = session.push(sessions.parse_frame(data))
+        except (ValueError, TypeError) as e:
+            emit('error', {'error': str(e)})
+            return
+
+        if window is not None:
+            # Score the completed window together with other sessions' windows
+            probabilities = batcher.predict(window)
+            prediction_index = int(np.argmax(probabilities))
+            emit('prediction', {
+                'gesture': str(gestures[prediction_index]),
+                'confidence': float(probabilities[prediction_index]),
+                'frame': session.frames_received
+            })
+
+    # Function to periodically drop idle sessions so memory stays bounded
+    def evict_idle_sessions():
+        while True:
+            socketio.sleep(max(STREAM_IDLE_TIMEOUT_S / 4, 1.0))
+            for session_id in sessions.evict_idle():
+                socketio.server.disconnect(session_id)
+
+    socketio.start_background_task(evict_idle_sessions)
+else:
+    socketio = None
+    print("flask_socketio is not installed; streaming sessions are disabled.")
+
+@app.route('/streaming_stats', methods=['GET'])
+def streaming_stats():
+    return jsonify(sessions.stats())
+
+@app.route('/batching_stats', methods=['GET'])
+def batching_stats():
+    # Batch-size and queue-wait histograms of the micro-batcher, plus model call latency
+    stats = batcher.stats()
+    stats['inference'] = runner.stats()
+    return jsonify(stats)
+
+# ============================
+# === Prometheus Metrics
+# ============================
+
+# Rolling request latency per endpoint, and response counts per endpoint and status
+request_timers = StageTimers()
+response_counts = {}
+response_counts_lock = threading.Lock()
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.get('request_start')
+    if start is not None and request.endpoint != 'metrics':
+        endpoint = request.endpoint or 'unknown'
+        request_timers.record(endpoint, (time.perf_counter() - start) * 1000.0)
+        key = (('endpoint', endpoint), ('status', str(response.status_code)))
+        with response_counts_lock:
+            response_counts[key] = response_counts.get(key, 0) + 1
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    inference_stats = runner.stats()
+    lines = []
+    lines += prometheus_value('slt_http_responses_total', 'HTTP responses by endpoint and status.',
+                              dict(response_counts), 'counter')
+    lines += prometheus_summary('slt_http_request_duration_seconds', 'HTTP request latency.',
+                                dict(request_timers.timers), label='endpoint')
+    lines += prometheus_histogram('slt_batch_size', 'Samples per micro-batched forward pass.',
+                                  batcher.batch_sizes.snapshot())
+    lines += prometheus_histogram('slt_batch_queue_wait_seconds', 'Time requests waited in the micro-batcher.',
+                                  batcher.queue_wait_ms.snapshot(), scale=0.001)
+    lines += prometheus_summary('slt_model_latency_seconds', 'Model forward pass latency.',
+                                {None: runner.latency})
+    lines += prometheus_value('slt_model_calls_total', 'Model forward passes.',
+                              {(('backend', inference_stats['backend']),): inference_stats['calls']}, 'counter')
+    lines += prometheus_value('slt_stream_sessions', 'Open streaming sessions.', {None: len(sessions)})
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
 # ============================
 # === Flask App Runner
 # ============================
@@ -122,5 +439,8 @@ if __name__ == '__main__':
     host = '0.0.0.0'  # Makes the server externally visible
     port = 5002  # Ensure this matches your configuration
 
-    # Run the Flask app
-    app.run(debug=True, host=host, port=port)
+    # Run the Flask app (through socket.io when streaming is available)
+    if socketio is not None:
+        socketio.run(app, debug=True, host=host, port=port)
+    else:
+        app.run(debug=True, host=host, port=port)
@@ -0,0 +1,110 @@
+# audio_writer.py
+# Writes recorded audio to a WAV file on a background thread as blocks arrive, so audio
+# memory stays constant for any recording length and the frame loop never handles audio.
+# The sounddevice callback only timestamps and queues each block. Blocks that arrive while
+# paused are dropped, matching the paused time the video writer cuts. The wall-clock time of
+# the first sample is kept so the muxer can line the audio up with the frame timestamps.
+
+import os
+import time
+import wave
+import queue
+import threading
+import numpy as np
+
+QUEUE_BLOCKS = 256  # Blocks buffered for the writer; overflow is written as silence
+
+
+# Appends float32 audio blocks to a 16-bit PCM WAV file
+class AudioWriter:
+    def __init__(self, path, samplerate, channels, queue_blocks=QUEUE_BLOCKS):
+        self.path = path
+        self.samplerate = samplerate
+        self.channels = channels
+        self.paused = False
+        self.start_time = None        # Wall-clock time of the first recorded sample
+        self.samples_written = 0
+        self.samples_dropped = 0      # Replaced by silence so later audio stays in sync
+        self.error = None
+        self._pending_silence = 0     # Dropped samples not yet queued ahead of a block
+        self._queue = queue.Queue(maxsize=queue_blocks)
+        self._closed = False
+        self._wav = wave.open(path, 'wb')
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(samplerate)
+        self._thread = threading.Thread(target=self._run, name='audio-writer', daemon=True)
+        self._thread.start()
+
+    # sounddevice InputStream callback; runs on the audio thread and must not block
+    def callback(self, indata, frames, time_info, status):
+        if self._closed or self.paused:
+            return
+        if self.start_time is None:
+            # The callback fires once the block is captured, so its first sample is one block older
+            self.start_time = time.time() - frames / self.samplerate
+        # Silence for earlier dropped blocks travels with the next block that fits, so it is
+        # written at the point of the gap rather than ahead of blocks queued before it
+        try:
+            self._queue.put_nowait((self._pending_silence, indata.copy()))
+            self._pending_silence = 0
+        except queue.Full:
+            self._pending_silence += frames
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def _write(self, block):
+        if self.error is not None:
+            return
+        try:
+            pcm = (np.clip(block, -1.0, 1.0) * 32767).astype('<i2')
+            self._wav.writeframes(pcm.tobytes())
+            self.samples_written += len(block)
+        except Exception as e:
+            self.error = e
+            print(f"Audio writer failed: {e}")
+
+    def _write_silence(self, samples):
+        if samples:
+            self.samples_dropped += samples
+            self._write(np.zeros((samples, self.channels), dtype=np.float32))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            silence, block = item
+            self._write_silence(silence)
+            self._write(block)
+        # Blocks dropped after the last queued one
+        self._write_silence(self._pending_silence)
+        self._pending_silence = 0
+
+    @property
+    def duration(self):
+        return self.samples_written / self.samplerate
+
+    # Function to flush queued blocks and close the file
+    # Returns the WAV path, or None if nothing was recorded or writing failed
+    def finish(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+            self._wav.close()
+        return self.path if self.error is None and self.samples_written else None
+
+    # Function to stop without keeping the file
+    def abort(self):
+        self.finish()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def summary(self):
+        return (f"{self.duration:.1f}s at {self.samplerate} Hz, "
+                f"{self.samples_dropped / self.samplerate:.2f}s dropped")
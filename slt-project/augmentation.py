@@ -0,0 +1,130 @@
+# augmentation.py
+# Batched landmark augmentation that runs inside the tf.data training pipeline, so every
+# epoch sees freshly augmented sequences without storing augmented copies. All ops work on
+# a whole (batch, sequence_length, num_landmarks) batch at once:
+#   mirroring      x -> 1 - x with the Left/Right hand slots swapped
+#   rotation/scale about the image centre, plus translation (x, y; z follows the scale)
+#   jitter         Gaussian noise on every coordinate
+#   temporal warp  resampling the sequence faster or slower around its middle frame
+#   frame dropout  replacing random frames with the frame before them
+# A hand that is all zeros (not detected) stays exactly zero, and frames are resampled by
+# nearest index rather than interpolated so detected and missing hands never blend.
+
+import math
+import tensorflow as tf
+from landmark_extraction import NUM_HAND_LANDMARKS
+from metrics import RollingTimer
+
+# Default strengths
+MAX_ROTATION_DEGREES = 15.0
+SCALE_RANGE = 0.1       # Scale drawn from [1 - range, 1 + range]
+MAX_SHIFT = 0.05        # In normalized image coordinates
+JITTER_STD = 0.003
+TIME_WARP = 0.2         # Playback rate drawn from [1 - warp, 1 + warp]
+MIRROR_PROB = 0.5
+FRAME_DROPOUT = 0.1     # Probability that a frame is replaced by its predecessor
+
+
+# Callable for Dataset.map: (x, y) -> (augmented x, y); also times every batch
+class LandmarkAugmenter:
+    def __init__(self, max_rotation=MAX_ROTATION_DEGREES, scale_range=SCALE_RANGE, max_shift=MAX_SHIFT,
+                 jitter_std=JITTER_STD, time_warp=TIME_WARP, mirror_prob=MIRROR_PROB,
+                 frame_dropout=FRAME_DROPOUT):
+        self.max_rotation = max_rotation * math.pi / 180.0
+        self.scale_range = scale_range
+        self.max_shift = max_shift
+        self.jitter_std = jitter_std
+        self.time_warp = time_warp
+        self.mirror_prob = mirror_prob
+        self.frame_dropout = frame_dropout
+        self.timer = RollingTimer()  # Augmentation milliseconds per batch
+
+    def augment(self, x):
+        batch = tf.shape(x)[0]
+        sequence_length, num_landmarks = x.shape[1], x.shape[2]
+        hands = tf.reshape(x, [batch, sequence_length, 2, NUM_HAND_LANDMARKS, 3])
+        present = tf.cast(tf.reduce_any(tf.not_equal(hands, 0.0), axis=[3, 4], keepdims=True), x.dtype)
+
+        def per_sample(values):
+            return tf.reshape(values, [batch, 1, 1, 1])
+
+        # Mirroring: flip x and swap the hand slots, so a left hand becomes a right hand
+        if self.mirror_prob > 0:
+            mirror = tf.reshape(tf.random.uniform([batch]) < self.mirror_prob, [batch, 1, 1, 1, 1])
+            mirrored = tf.reverse(hands, axis=[2])
+            mirrored = tf.concat([1.0 - mirrored[..., :1], mirrored[..., 1:]], axis=-1)
+            hands = tf.where(mirror, mirrored, hands)
+            present = tf.where(mirror, tf.reverse(present, axis=[2]), present)
+
+        # Rotation, scale and translation as one per-sample affine transform
+        angle = tf.random.uniform([batch], -self.max_rotation, self.max_rotation)
+        scale = tf.random.uniform([batch], 1.0 - self.scale_range, 1.0 + self.scale_range)
+        shift = tf.random.uniform([batch, 2], -self.max_shift, self.max_shift)
+        cos, sin = per_sample(tf.cos(angle) * scale), per_sample(tf.sin(angle) * scale)
+        centered_x, centered_y = hands[..., 0] - 0.5, hands[..., 1] - 0.5
+        hands = tf.stack([
+            cos * centered_x - sin * centered_y + 0.5 + per_sample(shift[:, 0]),
+            sin * centered_x + cos * centered_y + 0.5 + per_sample(shift[:, 1]),
+            hands[..., 2] * per_sample(scale)
+        ], axis=-1)
+
+        # Jitter
+        if self.jitter_std > 0:
+            hands += tf.random.normal(tf.shape(hands), stddev=self.jitter_std)
+
+        # Missing hands back to exactly zero
+        hands *= present
+
+        # Temporal warp and frame dropout as one nearest-frame gather
+        frames = tf.range(sequence_length, dtype=tf.float32)
+        middle = (sequence_length - 1) / 2.0
+        rate = tf.random.uniform([batch, 1], 1.0 - self.time_warp, 1.0 + self.time_warp)
+        positions = tf.clip_by_value(middle + (frames[tf.newaxis, :] - middle) * rate, 0.0, sequence_length - 1)
+        indices = tf.cast(tf.round(positions), tf.int32)
+        if self.frame_dropout > 0:
+            dropped = tf.random.uniform([batch, sequence_length]) < self.frame_dropout
+            indices = tf.where(dropped & (indices > 0), indices - 1, indices)
+        hands = tf.gather(hands, indices, batch_dims=1)
+
+        return tf.reshape(hands, [batch, sequence_length, num_landmarks])
+
+    def _record(self, elapsed_seconds):
+        self.timer.record(float(elapsed_seconds) * 1000.0)
+        return elapsed_seconds
+
+    def __call__(self, x, y):
+        start = tf.timestamp()
+        with tf.control_dependencies([start]):
+            augmented = self.augment(x)
+        with tf.control_dependencies([augmented]):
+            elapsed = tf.timestamp() - start
+        recorded = tf.numpy_function(self._record, [elapsed], tf.float64)
+        with tf.control_dependencies([recorded]):
+            augmented = tf.identity(augmented)
+        return augmented, y
+
+    def summary(self):
+        if not self.timer.count:
+            return 'no batches'
+        p50, p95 = self.timer.quantiles((0.5, 0.95)).values()
+        return (f"{self.timer.count} batches, mean {self.timer.total_ms / self.timer.count:.2f} ms, "
+                f"p50 {p50:.2f} ms, p95 {p95:.2f} ms per batch")
+
+
+# Prints the augmentation cost of each epoch's batches
+class AugmentationReport(tf.keras.callbacks.Callback):
+    def __init__(self, augmenter):
+        super().__init__()
+        self.augmenter = augmenter
+        self._count = 0
+        self._total_ms = 0.0
+
+    def on_epoch_end(self, epoch, logs=None):
+        timer = self.augmenter.timer
+        count, total_ms = timer.count - self._count, timer.total_ms - self._total_ms
+        self._count, self._total_ms = timer.count, timer.total_ms
+        if count:
+            print(f"Epoch {epoch + 1}: augmentation {total_ms / count:.2f} ms per batch over {count} batches "
+                  f"({total_ms / 1000.0:.2f}s total, overlapped with training by prefetch)")
+            if logs is not None:
+                logs['augment_ms_per_batch'] = total_ms / count
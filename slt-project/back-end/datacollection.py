@@ -4,6 +4,11 @@ import cv2
 import os
 import numpy as np
 import mediapipe as mp
+import sys
+
+# Share the landmark packing used by the main scripts in the parent directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from landmark_extraction import extract_landmarks
 
 # Define the gestures you want to collect data for
 gestures = ['5']
@@ -49,7 +54,7 @@ with mp_hands.Hands(
         gesture_path = os.path.join(DATA_PATH, gesture)
         
         for sequence in range(num_sequences):
-            landmarks_sequence = []
+            landmarks_sequence = np.zeros((sequence_length, num_landmarks_per_hand * 2), dtype=np.float32)
             print(f"  Starting sequence {sequence+1}/{num_sequences}")
             frame_count = 0
             
@@ -75,26 +80,8 @@ with mp_hands.Hands(
 
                 # Collect hand landmarks if detected
                 if results.multi_hand_landmarks and results.multi_handedness:
-                    # Prepare dictionaries to hold landmarks for left and right hands
-                    hand_landmarks_dict = {'Left': None, 'Right': None}
-
-                    # Loop through detected hands
-                    for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                        # Get the handedness label
-                        hand_label = results.multi_handedness[idx].classification[0].label
-                        # Extract landmark coordinates
-                        landmarks = []
-                        for lm in hand_landmarks.landmark:
-                            landmarks.extend([lm.x, lm.y, lm.z])
-                        hand_landmarks_dict[hand_label] = landmarks
-
-                    # Prepare combined landmarks for both hands
-                    # If a hand is not present, fill with zeros
-                    left_hand_landmarks = hand_landmarks_dict['Left'] or [0.0] * num_landmarks_per_hand
-                    right_hand_landmarks = hand_landmarks_dict['Right'] or [0.0] * num_landmarks_per_hand
-                    combined_landmarks = left_hand_landmarks + right_hand_landmarks
-
-                    landmarks_sequence.append(combined_landmarks)
+                    # Pack both hands straight into this frame's row of the sequence
+                    extract_landmarks(results, landmarks_sequence[frame_count])
                     frame_count += 1
 
                     # Draw hand landmarks on the image (optional)
@@ -125,7 +112,7 @@ with mp_hands.Hands(
             sequence_path = os.path.join(gesture_path, str(sequence))
             if not os.path.exists(sequence_path):
                 os.makedirs(sequence_path)
-            np.save(os.path.join(sequence_path, 'landmarks.npy'), landmarks_sequence)
+            np.save(os.path.join(sequence_path, 'landmarks.npy'), landmarks_sequence[:frame_count])
 
 cap.release()
 cv2.destroyAllWindows()
@@ -0,0 +1,270 @@
+# batch_translate.py
+# Headless translation of recorded signing videos. Each file is decoded and run through
+# MediaPipe in a worker process (Hands instances cannot be shared across processes), and
+# the per-frame landmarks are cached next to a stat of the source file. The parent process
+# replays the same windowing/prediction logic as main.py and writes timestamped transcripts.
+# Re-running with a new model only re-scores the cached landmarks.
+#
+#   python batch_translate.py recordings/ extra_clip.mp4 --workers 4 --output-dir transcripts
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from landmark_extraction import extract_landmarks, NUM_LANDMARKS
+from ring_buffer import LandmarkRingBuffer
+from prediction_smoothing import ProbabilitySmoother
+
+# Constants
+DATA_PATH = 'MP_Data'
+MODEL_PATH = 'gesture_recognition_model.keras'
+CACHE_PATH = 'landmark_cache'
+OUTPUT_PATH = 'transcripts'
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+SEQUENCE_LENGTH = 15
+THRESHOLD = 0.8
+PREDICT_CHUNK_SIZE = 256       # Windows scored per forward pass
+CACHE_VERSION = 1              # Bump when the detection settings below change
+MODEL_COMPLEXITY = 1
+
+
+# Function to expand files and directories into a sorted list of video files
+def find_videos(inputs):
+    videos = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                videos += [os.path.join(root, f) for f in files if f.lower().endswith(VIDEO_EXTENSIONS)]
+        elif os.path.isfile(path):
+            videos.append(path)
+        else:
+            print(f"Skipping {path}: not found")
+    return sorted(set(os.path.abspath(v) for v in videos))
+
+
+# Function to get the cache file and cache key for a video
+def cache_entry(video_path, cache_path):
+    stat = os.stat(video_path)
+    key = [CACHE_VERSION, MODEL_COMPLEXITY, stat.st_mtime_ns, stat.st_size]
+    name = hashlib.sha1(video_path.encode('utf-8')).hexdigest()
+    return os.path.join(cache_path, f'{name}.npz'), key
+
+
+# Function to load cached landmarks for a video, or None if missing or stale
+def load_cached(video_path, cache_path):
+    cache_file, key = cache_entry(video_path, cache_path)
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with np.load(cache_file) as cached:
+            if cached['key'].tolist() != key:
+                return None
+            return cached['landmarks'], cached['present'], cached['timestamps_ms']
+    except Exception as e:
+        print(f"Ignoring unreadable cache {cache_file}: {e}")
+        return None
+
+
+# Function to run MediaPipe over every frame of a video (worker process)
+# Returns (landmarks (N, num_landmarks) float32, present (N,) bool, timestamps_ms (N,) float64)
+def extract_video(video_path, cache_path):
+    import cv2
+    import mediapipe as mp
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    landmarks, present, timestamps_ms = [], [], []
+    frame_landmarks = np.zeros(NUM_LANDMARKS, dtype=np.float32)
+    # A fresh Hands per file so tracking state never carries over between videos
+    with mp.solutions.hands.Hands(
+            max_num_hands=2,
+            model_complexity=MODEL_COMPLEXITY,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5) as hands:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            position_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            timestamps_ms.append(position_ms if position_ms > 0 else len(timestamps_ms) * 1000.0 / fps)
+
+            # Same preprocessing as the live recognizer: selfie flip, then RGB
+            frame = cv2.flip(frame, 1)
+            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            image_rgb.flags.writeable = False
+            results = hands.process(image_rgb)
+
+            has_hands = extract_landmarks(results, frame_landmarks) is not None
+            landmarks.append(frame_landmarks.copy() if has_hands else np.zeros(NUM_LANDMARKS, dtype=np.float32))
+            present.append(has_hands)
+    cap.release()
+
+    landmarks = np.array(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS)
+    present = np.array(present, dtype=bool)
+    timestamps_ms = np.array(timestamps_ms, dtype=np.float64)
+
+    cache_file, key = cache_entry(video_path, cache_path)
+    os.makedirs(cache_path, exist_ok=True)
+    tmp_file = cache_file + '.tmp.npz'
+    np.savez(tmp_file, key=np.array(key, dtype=np.int64), landmarks=landmarks,
+             present=present, timestamps_ms=timestamps_ms)
+    os.replace(tmp_file, cache_file)
+    return landmarks, present, timestamps_ms
+
+
+# Function to collect the windows main.py would score, as (end frame index, window) pairs
+# `stride` is the number of hand frames between predictions; reset mode clears the window
+def collect_windows(landmarks, present, stride, reset):
+    sequence = LandmarkRingBuffer(SEQUENCE_LENGTH, NUM_LANDMARKS)
+    frames_since_prediction = 0
+    ends, windows = [], []
+    for idx in np.flatnonzero(present):
+        sequence.append(landmarks[idx])
+        frames_since_prediction += 1
+        if sequence.is_full() and frames_since_prediction >= stride:
+            frames_since_prediction = 0
+            ends.append(idx)
+            windows.append(sequence.ordered())
+            if reset:
+                sequence.clear()
+    if not windows:
+        return ends, np.empty((0, SEQUENCE_LENGTH, NUM_LANDMARKS), dtype=np.float32)
+    return ends, np.stack(windows)
+
+
+# Function to turn window predictions into transcript entries with main.py's thresholding
+# and repeated-word suppression
+def transcribe(ends, probabilities, timestamps_ms, gestures, smoother, threshold=THRESHOLD):
+    entries = []
+    last_prediction = ''
+    for end, window_probabilities in zip(ends, probabilities):
+        smoothed = smoother.update(window_probabilities)
+        prediction = int(np.argmax(smoothed))
+        confidence = float(smoothed[prediction])
+        if confidence > threshold and gestures[prediction] != last_prediction:
+            last_prediction = str(gestures[prediction])
+            entries.append({'time_ms': float(timestamps_ms[end]), 'gesture': last_prediction,
+                            'confidence': confidence})
+    return entries
+
+
+# Function to format milliseconds as HH:MM:SS.mmm
+def format_timestamp(ms):
+    seconds, ms = divmod(int(round(ms)), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{ms:03d}"
+
+
+# Function to get the transcript base name for a video; a short hash of the full path keeps
+# same-named videos from different directories apart
+def transcript_name(video_path):
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    return f"{stem}_{hashlib.sha1(video_path.encode('utf-8')).hexdigest()[:8]}"
+
+
+# Function to write a transcript as text and JSON next to each other
+def write_transcript(video_path, entries, output_path, model_path):
+    os.makedirs(output_path, exist_ok=True)
+    base = os.path.join(output_path, transcript_name(video_path))
+    with open(base + '.txt', 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(f"[{format_timestamp(entry['time_ms'])}] {entry['gesture']} ({entry['confidence']:.2f})\n")
+        f.write(f"\n{' '.join(entry['gesture'] for entry in entries)}\n")
+    with open(base + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'video': video_path, 'model': model_path, 'entries': entries}, f, indent=2)
+    return base + '.txt'
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+
+    parser = argparse.ArgumentParser(description='Translate recorded signing videos into timestamped transcripts.')
+    parser.add_argument('inputs', nargs='+', help='Video files or directories of videos')
+    parser.add_argument('--model', default=MODEL_PATH, help='Model file (.keras, .tflite or .onnx)')
+    parser.add_argument('--data-path', default=DATA_PATH, help='MP_Data directory that defines the gesture labels')
+    parser.add_argument('--output-dir', default=OUTPUT_PATH)
+    parser.add_argument('--cache-dir', default=CACHE_PATH)
+    parser.add_argument('--workers', type=int, default=max((os.cpu_count() or 2) - 1, 1))
+    parser.add_argument('--mode', choices=('stride', 'reset'), default='stride',
+                        help="Windowing, as SLT_RECOGNITION_MODE in main.py")
+    parser.add_argument('--stride', type=int, default=5, help='Hand frames between predictions in stride mode')
+    parser.add_argument('--smoothing', default='ema', help="'ema', 'mean', 'vote' or 'none' (stride mode)")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    parser.add_argument('--refresh-cache', action='store_true', help='Re-run MediaPipe even if cached')
+    args = parser.parse_args()
+
+    from inference import load_runner
+
+    gestures = np.array([
+        gesture for gesture in os.listdir(args.data_path)
+        if os.path.isdir(os.path.join(args.data_path, gesture))
+    ])
+    videos = find_videos(args.inputs)
+    if not videos:
+        print("No video files found.")
+        sys.exit(1)
+
+    try:
+        runner = load_runner(args.model, warmup_batch_sizes=(PREDICT_CHUNK_SIZE,))
+    except Exception as e:
+        print(f"An error occurred while loading the model: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+    reset = args.mode == 'reset'
+    stride = SEQUENCE_LENGTH if reset else args.stride
+
+    # Landmarks: cached files are read here, the rest go to the process pool
+    start = time.perf_counter()
+    extracted = {}
+    pending = []
+    for video in videos:
+        cached = None if args.refresh_cache else load_cached(video, args.cache_dir)
+        if cached is not None:
+            extracted[video] = cached
+        else:
+            pending.append(video)
+    print(f"{len(videos)} videos: {len(extracted)} cached, {len(pending)} to process with {args.workers} workers")
+
+    # Spawn rather than fork: the parent has already initialized TensorFlow for the model
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = {pool.submit(extract_video, video, args.cache_dir): video for video in pending}
+        for future in as_completed(futures):
+            video = futures[future]
+            try:
+                extracted[video] = future.result()
+                print(f"Extracted landmarks from {video}")
+            except Exception as e:
+                print(f"Failed to process {video}: {e}")
+    extraction_seconds = time.perf_counter() - start
+
+    # Prediction: the same windows main.py would score, batched per file
+    total_windows = 0
+    for video in videos:
+        if video not in extracted:
+            continue
+        landmarks, present, timestamps_ms = extracted[video]
+        ends, windows = collect_windows(landmarks, present, stride, reset)
+        probabilities = np.concatenate(
+            [runner.predict(windows[i:i + PREDICT_CHUNK_SIZE]) for i in range(0, len(windows), PREDICT_CHUNK_SIZE)]
+        ) if len(windows) else np.empty((0, len(gestures)), dtype=np.float32)
+        total_windows += len(windows)
+
+        smoother = ProbabilitySmoother('none' if reset else args.smoothing)
+        entries = transcribe(ends, probabilities, timestamps_ms, gestures, smoother, args.threshold)
+        path = write_transcript(video, entries, args.output_dir, args.model)
+        print(f"{video}: {len(landmarks)} frames, {len(windows)} windows, {len(entries)} words -> {path}")
+
+    print(f"Landmarks in {extraction_seconds:.1f}s; {total_windows} windows scored "
+          f"({runner.summary()}); total {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,124 @@
+# batching.py
+
+import threading
+import queue
+import time
+from concurrent.futures import Future
+import numpy as np
+
+# Default histogram bucket upper bounds
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+QUEUE_WAIT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+# Simple thread-safe histogram with fixed bucket upper bounds
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is the +Inf bucket
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        slot = len(self.buckets)
+        for idx, upper in enumerate(self.buckets):
+            if value <= upper:
+                slot = idx
+                break
+        with self._lock:
+            self.counts[slot] += 1
+            self.total += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            labels = [str(upper) for upper in self.buckets] + ['+Inf']
+            return {
+                'buckets': dict(zip(labels, self.counts)),
+                'count': self.count,
+                'sum': self.total,
+                'mean': self.total / self.count if self.count else 0.0
+            }
+
+
+# Collects concurrent single-sample requests and runs them as one batched forward pass
+class MicroBatcher:
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=3.0):
+        self.predict_fn = predict_fn  # Takes an (N, ...) float32 batch, returns (N, num_classes)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+        self._requests = queue.Queue()
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    # Queue one sample and return a Future that resolves to its prediction
+    def submit(self, sample):
+        future = Future()
+        self._requests.put((np.asarray(sample, dtype=np.float32), future, time.perf_counter()))
+        return future
+
+    # Queue one sample and block until its prediction is ready
+    def predict(self, sample, timeout=None):
+        return self.submit(sample).result(timeout=timeout)
+
+    def stats(self):
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'pending': self._requests.qsize(),
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_wait_ms': self.queue_wait_ms.snapshot()
+        }
+
+    def stop(self):
+        self._running = False
+        self._requests.put(None)
+        self._worker.join()
+
+    # Function to gather up to max_batch_size requests, waiting at most max_wait after the first
+    def _collect(self):
+        first = self._requests.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._running = False
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while self._running:
+            batch = self._collect()
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.queue_wait_ms.observe((started - enqueued) * 1000.0)
+            self.batch_sizes.observe(len(batch))
+
+            try:
+                inputs = np.stack([sample for sample, _, _ in batch])
+                outputs = np.asarray(self.predict_fn(inputs))
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            # Hand each caller back its own row of the batched result
+            for row, (_, future, _) in enumerate(batch):
+                future.set_result(outputs[row])
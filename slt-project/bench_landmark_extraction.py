@@ -0,0 +1,101 @@
+# bench_landmark_extraction.py
+# Microbenchmark: per-frame cost of the previous nested-list landmark packing versus
+# landmark_extraction.extract_landmarks, both on its own and including the work needed
+# to turn 15 frames into a model input. Runs without a camera; uses real MediaPipe
+# protobuf messages when mediapipe is installed and plain Python objects otherwise.
+
+import timeit
+from types import SimpleNamespace
+import numpy as np
+from landmark_extraction import extract_landmarks, NUM_LANDMARKS, NUM_LANDMARKS_PER_HAND
+from ring_buffer import LandmarkRingBuffer
+
+NUM_FRAMES = 20000
+NUM_REPEATS = 5  # Best of N runs, to keep scheduler noise out of the numbers
+SEQUENCE_LENGTH = 15
+
+
+# Function to build a fake hands.process() result with the given handedness labels
+def make_results(labels, rng):
+    try:
+        from mediapipe.framework.formats import landmark_pb2, classification_pb2
+    except ImportError:
+        landmark_pb2 = None
+
+    hands, handedness = [], []
+    for label in labels:
+        coords = rng.random((21, 3))
+        if landmark_pb2 is not None:
+            hand = landmark_pb2.NormalizedLandmarkList()
+            for x, y, z in coords:
+                hand.landmark.add(x=x, y=y, z=z)
+            classification = classification_pb2.ClassificationList()
+            classification.classification.add(label=label, score=1.0)
+        else:
+            hand = SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in coords])
+            classification = SimpleNamespace(classification=[SimpleNamespace(label=label)])
+        hands.append(hand)
+        handedness.append(classification)
+    return SimpleNamespace(multi_hand_landmarks=hands, multi_handedness=handedness), landmark_pb2 is not None
+
+
+# The packing loop previously copied into main.py, video_record.py and datacollection.py
+def legacy_extract(results):
+    hand_landmarks_dict = {'Left': None, 'Right': None}
+    for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
+        hand_label = results.multi_handedness[idx].classification[0].label
+        landmarks = []
+        for lm in hand_landmarks.landmark:
+            landmarks.extend([lm.x, lm.y, lm.z])
+        hand_landmarks_dict[hand_label] = landmarks
+    left_hand_landmarks = hand_landmarks_dict['Left'] or [0.0] * NUM_LANDMARKS_PER_HAND
+    right_hand_landmarks = hand_landmarks_dict['Right'] or [0.0] * NUM_LANDMARKS_PER_HAND
+    return left_hand_landmarks + right_hand_landmarks
+
+
+# Previous live-loop path: list append/slice per frame, nested-list conversion per window
+def legacy_window(results):
+    sequence = []
+    for _ in range(SEQUENCE_LENGTH):
+        sequence.append(legacy_extract(results))
+        sequence = sequence[-SEQUENCE_LENGTH:]
+    input_data = np.expand_dims(sequence, axis=0)
+    return np.array(input_data, dtype=np.float32)
+
+
+# Current live-loop path: extract into a preallocated frame, append to the ring buffer
+def new_window(results, frame, buffer):
+    for _ in range(SEQUENCE_LENGTH):
+        buffer.append(extract_landmarks(results, frame))
+    return buffer.window()
+
+
+# Function to time a callable and return microseconds per frame
+def per_frame_us(fn, frames_per_call=1):
+    calls = NUM_FRAMES // frames_per_call
+    best = min(timeit.repeat(fn, number=calls, repeat=NUM_REPEATS))
+    return best / (calls * frames_per_call) * 1e6
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    frame = np.zeros(NUM_LANDMARKS, dtype=np.float32)
+    buffer = LandmarkRingBuffer(SEQUENCE_LENGTH, NUM_LANDMARKS)
+
+    for labels in (['Right'], ['Left', 'Right']):
+        results, real_protobuf = make_results(labels, rng)
+        assert np.allclose(legacy_extract(results), extract_landmarks(results, frame))
+        assert np.allclose(legacy_window(results), new_window(results, frame, buffer))
+
+        source = 'mediapipe protobuf' if real_protobuf else 'python objects'
+        print(f"{len(labels)} hand(s), {source}:")
+        for name, legacy_fn, new_fn, frames_per_call in (
+            ('frame -> float32', lambda: np.array(legacy_extract(results), dtype=np.float32),
+             lambda: extract_landmarks(results, frame), 1),
+            ('frame -> model input', lambda: legacy_window(results),
+             lambda: new_window(results, frame, buffer), SEQUENCE_LENGTH)
+        ):
+            legacy_us = per_frame_us(legacy_fn, frames_per_call)
+            new_us = per_frame_us(new_fn, frames_per_call)
+            print(f"  {name:<22} legacy {legacy_us:6.2f} us/frame, new {new_us:6.2f} us/frame "
+                  f"(saves {legacy_us - new_us:5.2f} us, {legacy_us / new_us:.2f}x)")
@@ -0,0 +1,190 @@
+# benchmark.py
+# Offline model benchmark: replays the packed MP_Data sequences through each backend at a
+# range of batch sizes and writes throughput, latency percentiles, peak RSS and held-out accuracy as
+# JSON. Needs no camera or display. Each backend runs in its own process so peak RSS and
+# warm-up state do not leak between backends.
+#
+#   python benchmark.py --model gesture_recognition_model.keras --max-batch 64 --output bench.json
+
+import os
+import sys
+import json
+import time
+import glob
+import argparse
+import platform
+import multiprocessing
+import numpy as np
+import landmark_store
+
+# Constants
+DATA_PATH = 'MP_Data'
+MODEL_PATH = 'gesture_recognition_model.keras'
+BACKENDS = ('keras', 'compiled', 'tflite', 'onnx')
+MAX_BATCH_SIZE = 64
+NUM_REPEATS = 3  # Passes over the data per batch size
+REPORT_PATH = 'benchmark_report.json'
+EXPORT_PATH = 'exported_models'  # Same directory export_model.py writes to
+
+
+# Function to read this process's peak resident set size in bytes, or None if unavailable
+def peak_rss_bytes():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024  # kB on Linux
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)  # peak_wset on Windows
+    except ImportError:
+        return None
+
+
+# Function to build a predict function for one backend: (N, L, F) float32 -> (N, C)
+def load_predict_fn(backend, model_path, sequence_length, num_landmarks):
+    from inference import InferenceRunner, TFLiteRunner, ONNXRunner
+
+    if backend == 'keras':
+        # Plain model.predict, the path the scripts used before the compiled runner
+        import tensorflow as tf
+        model = tf.keras.models.load_model(model_path, compile=False)
+        return lambda batch: model.predict(batch, verbose=0)
+    if backend == 'compiled':
+        import tensorflow as tf
+        model = tf.keras.models.load_model(model_path, compile=False)
+        return InferenceRunner(model, sequence_length, num_landmarks).predict
+    if backend == 'tflite':
+        return TFLiteRunner(model_path, sequence_length, num_landmarks).predict
+    if backend == 'onnx':
+        return ONNXRunner(model_path, sequence_length, num_landmarks).predict
+    raise ValueError(f"Unknown backend '{backend}'. Expected one of {BACKENDS}")
+
+
+# Function to benchmark one backend/model in the current process
+def run_backend(backend, model_path, gestures, packed_path, batch_sizes, max_samples, repeats):
+    from sklearn.model_selection import train_test_split
+
+    X, y = landmark_store.load_labeled(gestures, packed_path)
+
+    # Accuracy is measured on Model.py's held-out split only; throughput uses every row
+    _, val_idx = train_test_split(np.arange(len(y)), test_size=0.1, random_state=42, stratify=y)
+    held_out = np.zeros(len(y), dtype=bool)
+    held_out[val_idx] = True
+    if max_samples:
+        X, y, held_out = X[:max_samples], y[:max_samples], held_out[:max_samples]
+    X = np.ascontiguousarray(X, dtype=np.float32)  # Read the shard once, outside the timed loop
+    _, sequence_length, num_landmarks = X.shape
+
+    start = time.perf_counter()
+    predict = load_predict_fn(backend, model_path, sequence_length, num_landmarks)
+    result = {
+        'backend': backend,
+        'model': model_path,
+        'load_seconds': time.perf_counter() - start,
+        'samples': len(X),
+        'accuracy_samples': int(held_out.sum()),
+        'batches': {}
+    }
+    if os.path.exists(model_path):
+        result['model_size_bytes'] = os.path.getsize(model_path)
+
+    accuracy = None
+    for batch_size in batch_sizes:
+        predict(X[:batch_size])  # Warm up this batch shape
+        latencies = []
+        predictions = np.empty(len(X), dtype=np.int64)
+        run_start = time.perf_counter()
+        for _ in range(repeats):
+            for offset in range(0, len(X), batch_size):
+                batch = X[offset:offset + batch_size]
+                batch_start = time.perf_counter()
+                probabilities = predict(batch)
+                latencies.append((time.perf_counter() - batch_start) * 1000.0)
+                predictions[offset:offset + len(batch)] = np.argmax(probabilities, axis=1)
+        elapsed = time.perf_counter() - run_start
+
+        batch_accuracy = float(np.mean(predictions[held_out] == y[held_out])) if held_out.any() else None
+        accuracy = batch_accuracy if accuracy is None else accuracy
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (0.0, 0.0, 0.0)
+        result['batches'][str(batch_size)] = {
+            'throughput_samples_per_s': len(X) * repeats / elapsed if elapsed else 0.0,
+            'latency_p50_ms': float(p50),
+            'latency_p95_ms': float(p95),
+            'latency_p99_ms': float(p99),
+            'latency_mean_ms': float(np.mean(latencies)) if latencies else 0.0,
+            'accuracy': batch_accuracy
+        }
+        print(f"  {backend:<10} batch {batch_size:>4}: {result['batches'][str(batch_size)]['throughput_samples_per_s']:>10.1f} "
+              f"samples/s, p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+
+    result['accuracy'] = accuracy
+    result['peak_rss_bytes'] = peak_rss_bytes()
+    return result
+
+
+# Function to run one benchmark in a fresh process and return its result (or an error entry)
+def run_isolated(args):
+    backend, model_path = args[0], args[1]
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(1) as pool:
+        try:
+            return pool.apply(run_backend, args)
+        except Exception as e:
+            print(f"{backend} benchmark of {model_path} failed: {e}")
+            return {'backend': backend, 'model': model_path, 'error': str(e)}
+
+
+# Function to find the model files each backend should be benchmarked on
+def backend_models(backends, model_path, export_path):
+    runs = []
+    for backend in backends:
+        if backend in ('keras', 'compiled'):
+            runs.append((backend, model_path))
+        elif backend == 'tflite':
+            runs += [(backend, path) for path in sorted(glob.glob(os.path.join(export_path, '*.tflite')))]
+        elif backend == 'onnx':
+            runs += [(backend, path) for path in sorted(glob.glob(os.path.join(export_path, '*.onnx')))]
+    return runs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark gesture model backends on recorded MP_Data sequences.')
+    parser.add_argument('--model', default=MODEL_PATH, help='Keras model for the keras/compiled backends')
+    parser.add_argument('--export-path', default=EXPORT_PATH, help='Directory holding .tflite/.onnx exports')
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--backends', default=','.join(BACKENDS), help='Comma-separated subset of ' + ','.join(BACKENDS))
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH_SIZE, help='Benchmark batch sizes 1, 2, 4, ... up to this')
+    parser.add_argument('--samples', type=int, default=0, help='Limit the number of sequences (0 = all)')
+    parser.add_argument('--repeats', type=int, default=NUM_REPEATS)
+    parser.add_argument('--output', default=REPORT_PATH, help='Where to write the JSON report')
+    args = parser.parse_args()
+
+    gestures = [
+        gesture for gesture in os.listdir(args.data_path)
+        if os.path.isdir(os.path.join(args.data_path, gesture))
+    ]
+    landmark_store.sync_dataset(args.data_path)
+    batch_sizes = [2 ** i for i in range(args.max_batch.bit_length()) if 2 ** i <= args.max_batch]
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'cpu_count': os.cpu_count(),
+        'gestures': gestures,
+        'batch_sizes': batch_sizes,
+        'repeats': args.repeats,
+        'results': []
+    }
+    for backend, model_path in backend_models(args.backends.split(','), args.model, args.export_path):
+        print(f"Benchmarking {backend} ({model_path})")
+        report['results'].append(run_isolated(
+            (backend, model_path, gestures, landmark_store.PACKED_PATH, batch_sizes, args.samples, args.repeats)))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark report saved to {args.output}")
@@ -4,12 +4,13 @@ import cv2
 import os
 import numpy as np
 import mediapipe as mp
-import tkinter as tk  # For getting screen size
-from tkinter import simpledialog, messagebox
 import subprocess
 import sys
-import win32gui  # For window management
-import time  # For delays
+import argparse
+import landmark_store  # Packed, memory-mapped dataset shard
+from landmark_extraction import extract_landmarks  # Vectorized landmark packing
+from frame_sources import open_source, add_source_arguments
+import window_utils  # Window helpers; tkinter/pywin32 are only imported when a window is shown
 
 # Constants
 GESTURES_FILE = 'gestures.txt'  # File to keep track of existing gestures
@@ -20,6 +21,9 @@ NUM_LANDMARKS_PER_HAND = 21 * 3  # 21 landmarks * 3 coordinates
 
 # Function to get gesture labels from the user via a GUI dialog
 def get_gesture_labels_gui(existing_gestures):
+    import tkinter as tk
+    from tkinter import simpledialog, messagebox
+
     # Initialize Tkinter root
     root = tk.Tk()
     root.withdraw()  # Hide the root window
@@ -77,14 +81,40 @@ def retrain_model():
         print("Model retraining completed successfully.")
     except subprocess.CalledProcessError as e:
         print(f"An error occurred while retraining the model: {e}")
-        messagebox.showerror("Model Retraining Error", f"An error occurred while retraining the model:\n{e}")
+        window_utils.show_error("Model Retraining Error", f"An error occurred while retraining the model:\n{e}")
+        return False
+    return True
+
+# Function to parse --labels into new gesture labels, rejecting ones that already exist
+def parse_labels(labels, existing_gestures):
+    gesture_labels = [label.strip() for label in labels.split(',') if label.strip()]
+    duplicate_gestures = set(gesture_labels) & set(existing_gestures)
+    if duplicate_gestures:
+        print(f"The following gestures already exist: {', '.join(duplicate_gestures)}.")
+        exit()
+    if not gesture_labels:
+        print("Please enter at least one valid gesture label.")
+        exit()
+    return gesture_labels
 
 def main():
+    parser = add_source_arguments(argparse.ArgumentParser(description='Collect landmark sequences for new gestures.'))
+    parser.add_argument('--labels', help='Comma-separated gesture labels (skips the label dialog)')
+    parser.add_argument('--no-retrain', action='store_true', help='Do not retrain the model afterwards')
+    args = parser.parse_args()
+    window_utils.set_headless(args.headless)
+
     # Load existing gestures
     existing_gestures = load_existing_gestures()
 
-    # Get gesture labels from the user via GUI
-    gestures = get_gesture_labels_gui(existing_gestures)
+    # Get gesture labels from the command line or from the user via GUI
+    if args.labels:
+        gestures = parse_labels(args.labels, existing_gestures)
+    elif args.headless:
+        print("--labels is required with --headless.")
+        exit()
+    else:
+        gestures = get_gesture_labels_gui(existing_gestures)
 
     # Number of sequences per gesture
     num_sequences = NUM_SEQUENCES
@@ -105,14 +135,25 @@ def main():
         if not os.path.exists(gesture_path):
             os.makedirs(gesture_path)
 
+    # Sync the shard with existing sequences first so new ones can be appended to it
+    landmark_store.sync_dataset(DATA_PATH_FULL, landmark_store.PACKED_PATH,
+                                sequence_length, NUM_LANDMARKS_PER_HAND * 2)
+
     # Initialize MediaPipe Hands
     mp_hands = mp.solutions.hands
     mp_drawing = mp.solutions.drawing_utils
 
-    # Access the camera
-    cap = cv2.VideoCapture(0)
+    # Open the frame source (camera by default); landmark replay has no images to detect on
+    try:
+        cap = open_source(args.source, fps=args.source_fps, max_frames=args.max_frames, loop=args.loop)
+    except Exception as e:
+        window_utils.show_error("Camera Error", f"Cannot open frame source '{args.source}': {e}")
+        exit()
+    if cap.landmarks_only:
+        print("Landmark replay sources cannot be used for data collection.")
+        exit()
     if not cap.isOpened():
-        messagebox.showerror("Camera Error", "Cannot access the camera.")
+        window_utils.show_error("Camera Error", "Cannot access the camera.")
         exit()
 
     # =======================
@@ -121,54 +162,30 @@ def main():
 
     # Create and configure the OpenCV window
     window_name = 'Data Collection'
-    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-
-    # Get screen size using tkinter
-    root = tk.Tk()
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
-    root.destroy()
-
-    # Set window size
-    window_width = 800
-    window_height = 600
-    cv2.resizeWindow(window_name, window_width, window_height)
-
-    # Calculate top-left corner to center the window
-    x = (screen_width // 2) - (window_width // 2)
-    y = (screen_height // 2) - (window_height // 2)
-
-    # Move window to center
-    cv2.moveWindow(window_name, x, y)
-
-    # Function to bring window to front
-    def bring_window_to_front(window_title):
-        try:
-            hwnd = win32gui.FindWindow(None, window_title)
-            if hwnd:
-                win32gui.SetForegroundWindow(hwnd)
-        except Exception as e:
-            print(f"Failed to bring window to front: {e}")
-
-    # Allow some time for the window to initialize
-    time.sleep(0.5)
-    bring_window_to_front(window_name)
+    if not args.headless:
+        window_utils.create_window(window_name, 800, 600)
 
     # =======================
     # === End Window Configuration
     # =======================
 
+    source_done = False  # Set when a file or image-directory source runs out of frames
+
     with mp_hands.Hands(
             max_num_hands=2,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5) as hands:
 
         for gesture in gestures:
+            if source_done:
+                break
             print(f"\nCollecting data for gesture: '{gesture}'")
             gesture_path = os.path.join(DATA_PATH_FULL, gesture)
 
             for sequence in range(num_sequences):
-                landmarks_sequence = []
+                if source_done:
+                    break
+                landmarks_sequence = np.zeros((sequence_length, NUM_LANDMARKS_PER_HAND * 2), dtype=np.float32)
                 print(f"  Starting sequence {sequence+1}/{num_sequences}")
                 frame_count = 0
 
@@ -176,6 +193,7 @@ def main():
                     ret, frame = cap.read()
                     if not ret:
                         print("Failed to capture image.")
+                        source_done = True
                         break
 
                     # Flip the frame horizontally for a later selfie-view display
@@ -194,26 +212,8 @@ def main():
 
                     # Collect hand landmarks if detected
                     if results.multi_hand_landmarks and results.multi_handedness:
-                        # Prepare dictionaries to hold landmarks for left and right hands
-                        hand_landmarks_dict = {'Left': None, 'Right': None}
-
-                        # Loop through detected hands
-                        for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                            # Get the handedness label
-                            hand_label = results.multi_handedness[idx].classification[0].label
-                            # Extract landmark coordinates
-                            landmarks = []
-                            for lm in hand_landmarks.landmark:
-                                landmarks.extend([lm.x, lm.y, lm.z])
-                            hand_landmarks_dict[hand_label] = landmarks
-
-                        # Prepare combined landmarks for both hands
-                        # If a hand is not present, fill with zeros
-                        left_hand_landmarks = hand_landmarks_dict['Left'] or [0.0] * NUM_LANDMARKS_PER_HAND
-                        right_hand_landmarks = hand_landmarks_dict['Right'] or [0.0] * NUM_LANDMARKS_PER_HAND
-                        combined_landmarks = left_hand_landmarks + right_hand_landmarks
-
-                        landmarks_sequence.append(combined_landmarks)
+                        # Pack both hands straight into this frame's row of the sequence
+                        extract_landmarks(results, landmarks_sequence[frame_count])
                         frame_count += 1
 
                         # Draw hand landmarks on the image (optional)
@@ -231,6 +231,9 @@ def main():
                             image, 'No hands detected', (10, 30),
                             cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2, cv2.LINE_AA)
 
+                    if args.headless:
+                        continue
+
                     # Display the frame
                     cv2.imshow(window_name, image)
 
@@ -240,37 +243,37 @@ def main():
                         cv2.destroyAllWindows()
                         exit()
 
+                # Nothing to save if the source ended before this sequence started
+                if frame_count == 0:
+                    break
+
                 # Save the sequence of landmarks
                 sequence_path = os.path.join(gesture_path, str(sequence))
                 if not os.path.exists(sequence_path):
                     os.makedirs(sequence_path)
-                np.save(os.path.join(sequence_path, 'landmarks.npy'), landmarks_sequence)
+                landmarks_file = os.path.join(sequence_path, 'landmarks.npy')
+                landmarks_sequence = landmarks_sequence[:frame_count]  # Shorter only if capture failed
+                np.save(landmarks_file, landmarks_sequence)
+
+                # Append the sequence to the packed shard used for training
+                landmark_store.append_sequence(
+                    gesture, landmarks_sequence, source=landmarks_file,
+                    sequence_length=sequence_length, num_landmarks=NUM_LANDMARKS_PER_HAND * 2)
                 print(f"  Sequence {sequence+1} saved.")
 
     print("\nData collection complete.")
     cap.release()
-    cv2.destroyAllWindows()
+    if not args.headless:
+        cv2.destroyAllWindows()
 
     # Update gestures.txt with new gestures
     update_gestures_file(gestures)
 
     # Retrain the model if new gestures were added
-    if gestures:
-        retrain_model()
-    
-    # ================================
-    # === Add Tkinter MessageBox Here ===
-    # ================================
-
-    # Initialize a new Tkinter root window
-        root = tk.Tk()
-        root.withdraw()  # Hide the root window
-
-    # Display the success message
-        messagebox.showinfo("Model Training", "Model has been retrained successfully!")
-
-    # Destroy the root window after the message box is closed
-        root.destroy()
+    if gestures and not args.no_retrain:
+        if retrain_model():
+            # Display the success message (printed when headless)
+            window_utils.show_info("Model Training", "Model has been retrained successfully!")
         
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+# export_model.py
+
+import os
+import sys
+import json
+import time
+import numpy as np
+import tensorflow as tf
+from inference import InferenceRunner, TFLiteRunner, ONNXRunner
+
+# Constants
+EXPORT_PATH = 'exported_models'
+MODEL_NAME = 'gesture_recognition_model'
+NUM_CALIBRATION_SAMPLES = 200  # MP_Data sequences used to calibrate int8 quantization
+TFLITE_QUANTIZATIONS = (None, 'float16', 'int8')
+
+
+# Function to convert a Keras model to TFLite, optionally with post-training quantization
+def export_tflite(model, output_path, quantization=None, calibration_data=None):
+    def build_converter(select_tf_ops):
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        if quantization == 'float16':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        elif quantization == 'int8':
+            # Calibrate activation ranges on real MP_Data sequences; inputs/outputs stay float32
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = lambda: (
+                [sample[np.newaxis].astype(np.float32)] for sample in calibration_data
+            )
+        if select_tf_ops:
+            converter.target_spec.supported_ops = [
+                tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS
+            ]
+        return converter
+
+    try:
+        tflite_model = build_converter(select_tf_ops=False).convert()
+    except Exception as e:
+        # Some attention ops only convert with the TensorFlow op fallback enabled
+        print(f"Builtin-only TFLite conversion failed ({e}); retrying with SELECT_TF_OPS.")
+        tflite_model = build_converter(select_tf_ops=True).convert()
+
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+    return output_path
+
+
+# Function to convert a Keras model to ONNX (requires tf2onnx)
+def export_onnx(model, output_path, sequence_length, num_landmarks):
+    try:
+        import tf2onnx
+    except ImportError:
+        print("tf2onnx is not installed; skipping ONNX export.")
+        return None
+
+    input_signature = [tf.TensorSpec([None, sequence_length, num_landmarks], tf.float32, name='landmarks')]
+    tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=13, output_path=output_path)
+    return output_path
+
+
+# Function to measure accuracy and single-window latency of a runner on held-out data
+def evaluate_runner(runner, X, y):
+    latencies = []
+    correct = 0
+    for sample, label in zip(X, y):
+        start = time.perf_counter()
+        probabilities = runner.predict_one(sample)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        correct += int(np.argmax(probabilities) == label)
+
+    latencies = np.array(latencies)
+    return {
+        'accuracy': correct / len(y) if len(y) else 0.0,
+        'latency_mean_ms': float(latencies.mean()) if len(latencies) else 0.0,
+        'latency_p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+        'latency_p95_ms': float(np.percentile(latencies, 95)) if len(latencies) else 0.0
+    }
+
+
+# Function to export every artifact and compare each one against the Keras model
+def export_all(model, X_calibration, X_val, y_val, output_dir=EXPORT_PATH,
+               sequence_length=15, num_landmarks=21 * 3 * 2):
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Pick a fixed random subset of training sequences for int8 calibration
+    rng = np.random.default_rng(42)
+    picks = rng.choice(len(X_calibration), size=min(NUM_CALIBRATION_SAMPLES, len(X_calibration)), replace=False)
+    calibration_data = np.asarray(X_calibration[np.sort(picks)], dtype=np.float32)
+
+    artifacts = {}
+    for quantization in TFLITE_QUANTIZATIONS:
+        suffix = f'_{quantization}' if quantization else ''
+        path = os.path.join(output_dir, f'{MODEL_NAME}{suffix}.tflite')
+        try:
+            artifacts[f'tflite{suffix}'] = export_tflite(model, path, quantization, calibration_data)
+            print(f"Exported {path}")
+        except Exception as e:
+            print(f"TFLite export ({quantization or 'float32'}) failed: {e}")
+
+    try:
+        onnx_path = export_onnx(model, os.path.join(output_dir, f'{MODEL_NAME}.onnx'), sequence_length, num_landmarks)
+    except Exception as e:
+        onnx_path = None
+        print(f"ONNX export failed: {e}")
+    if onnx_path:
+        artifacts['onnx'] = onnx_path
+        print(f"Exported {onnx_path}")
+
+    # Compare accuracy and latency of every artifact against the Keras model
+    report = {'keras': evaluate_runner(InferenceRunner(model, sequence_length, num_landmarks), X_val, y_val)}
+    for name, path in artifacts.items():
+        try:
+            runner_class = ONNXRunner if name == 'onnx' else TFLiteRunner
+            runner = runner_class(path, sequence_length, num_landmarks)
+            report[name] = evaluate_runner(runner, X_val, y_val)
+            report[name]['size_bytes'] = os.path.getsize(path)
+            report[name]['path'] = path
+        except Exception as e:
+            print(f"Could not evaluate {path}: {e}")
+
+    print(f"\n{'backend':<16}{'accuracy':>10}{'mean ms':>10}{'p95 ms':>10}{'size KB':>10}")
+    for name, result in report.items():
+        size = f"{result['size_bytes'] / 1024:.0f}" if result.get('size_bytes') else '-'
+        print(f"{name:<16}{result['accuracy']:>10.3f}{result['latency_mean_ms']:>10.2f}"
+              f"{result['latency_p95_ms']:>10.2f}{size:>10}")
+
+    report_path = os.path.join(output_dir, 'export_report.json')
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Export report saved to {report_path}")
+    return report
+
+
+# Re-export an already trained model, calibrating and evaluating on the packed MP_Data shard
+if __name__ == '__main__':
+    import landmark_store
+
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    data_path = 'MP_Data'
+    model_path = sys.argv[1] if len(sys.argv) > 1 else f'{MODEL_NAME}.keras'
+
+    gestures = [
+        gesture for gesture in os.listdir(data_path)
+        if os.path.isdir(os.path.join(data_path, gesture))
+    ]
+    landmark_store.sync_dataset(data_path)
+    X, y = landmark_store.load_labeled(gestures)
+
+    # Calibrate on the training rows and evaluate on the held-out rows, using Model.py's split
+    from sklearn.model_selection import train_test_split
+    train_idx, val_idx = train_test_split(
+        np.arange(len(y)), test_size=0.1, random_state=42, stratify=y
+    )
+    X_val = np.asarray(X[val_idx], dtype=np.float32)
+
+    keras_model = tf.keras.models.load_model(model_path, compile=False)
+    export_all(keras_model, X[np.sort(train_idx)], X_val, y[val_idx])
+
@@ -0,0 +1,179 @@
+# frame_sources.py
+# Pluggable frame sources with the cv2.VideoCapture interface (read / isOpened / release),
+# so the recognizer can run from a camera, a video file, a directory of images, or a replay
+# of recorded landmarks that skips MediaPipe entirely.
+#
+#   --source 0                      camera index
+#   --source clip.mp4               video file
+#   --source frames/                directory of images
+#   --source replay:MP_Data_packed  landmark replay (packed shard, .npy or .npz file, or MP_Data tree)
+#   --source synthetic              generated landmark motion
+
+import os
+import time
+import cv2
+import numpy as np
+from landmark_extraction import NUM_LANDMARKS
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+REPLAY_PREFIX = 'replay:'
+SYNTHETIC_FRAMES = 600
+REPLAY_CANVAS_SHAPE = (480, 640, 3)  # Blank image shown for landmark replay sources
+
+
+# Base class: optional pacing to a fixed frame rate and a cap on the number of frames
+class FrameSource:
+    landmarks_only = False  # True if read() returns (num_landmarks,) frames instead of images
+    live = False            # True for cameras; finite sources are read without dropping frames
+
+    def __init__(self, fps=None, max_frames=0):
+        self.interval = 1.0 / fps if fps else 0.0
+        self.max_frames = max_frames
+        self.frames_read = 0
+        self._next_time = None
+
+    def read(self):
+        if self.max_frames and self.frames_read >= self.max_frames:
+            return False, None
+        if self.interval:
+            now = time.perf_counter()
+            if self._next_time is not None and now < self._next_time:
+                time.sleep(self._next_time - now)
+            self._next_time = max(now, self._next_time or now) + self.interval
+        ret, frame = self._read()
+        if ret:
+            self.frames_read += 1
+        return ret, frame
+
+    def _read(self):
+        raise NotImplementedError
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+
+# Camera index or video file through cv2.VideoCapture
+class VideoSource(FrameSource):
+    def __init__(self, source, fps=None, max_frames=0):
+        super().__init__(fps, max_frames)
+        self.live = isinstance(source, int)
+        self.cap = cv2.VideoCapture(source)
+
+    def _read(self):
+        return self.cap.read()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+# Sorted images from a directory, optionally looping
+class ImageDirectorySource(FrameSource):
+    def __init__(self, path, fps=None, max_frames=0, loop=False):
+        super().__init__(fps, max_frames)
+        self.paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.loop = loop
+        self._position = 0
+
+    def _read(self):
+        while self._position < len(self.paths) or (self.loop and self.paths):
+            if self._position >= len(self.paths):
+                self._position = 0
+            path = self.paths[self._position]
+            self._position += 1
+            frame = cv2.imread(path)
+            if frame is not None:
+                return True, frame
+            print(f"Skipping unreadable image {path}")
+        return False, None
+
+    def isOpened(self):
+        return bool(self.paths)
+
+
+# Function to generate smooth two-hand landmark motion for synthetic replay
+def synthetic_landmarks(num_frames=SYNTHETIC_FRAMES, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.2, 0.8, NUM_LANDMARKS).astype(np.float32)
+    phase = rng.uniform(0, 2 * np.pi, NUM_LANDMARKS).astype(np.float32)
+    t = np.arange(num_frames, dtype=np.float32)[:, np.newaxis]
+    return base + 0.05 * np.sin(t / 10.0 + phase)
+
+
+# Function to load (N, num_landmarks) frames from a packed shard, .npy/.npz file or MP_Data tree
+def load_replay_frames(path):
+    import landmark_store
+
+    if os.path.isdir(path):
+        if os.path.exists(os.path.join(path, landmark_store.INDEX_FILE)):
+            X, _ = landmark_store.open_shard(path)
+            return np.asarray(X, dtype=np.float32).reshape(-1, NUM_LANDMARKS)
+        files = sorted(
+            os.path.join(root, name) for root, _, names in os.walk(path)
+            for name in names if name.endswith('.npy')
+        )
+        if not files:
+            raise FileNotFoundError(f"No landmark files found under {path}")
+        return np.concatenate([np.load(f).reshape(-1, NUM_LANDMARKS) for f in files]).astype(np.float32)
+    if path.endswith('.npz'):
+        with np.load(path) as data:
+            return np.asarray(data['landmarks'], dtype=np.float32).reshape(-1, NUM_LANDMARKS)
+    return np.load(path).astype(np.float32).reshape(-1, NUM_LANDMARKS)
+
+
+# Recorded or synthetic (num_landmarks,) frames; all-zero frames mean no hands in view
+class LandmarkReplaySource(FrameSource):
+    landmarks_only = True
+
+    def __init__(self, frames, fps=None, max_frames=0, loop=False):
+        super().__init__(fps, max_frames)
+        self.frames = np.ascontiguousarray(frames, dtype=np.float32)
+        self.loop = loop
+        self._position = 0
+
+    def _read(self):
+        if self._position >= len(self.frames):
+            if not self.loop or not len(self.frames):
+                return False, None
+            self._position = 0
+        frame = self.frames[self._position]
+        self._position += 1
+        return True, frame
+
+    def isOpened(self):
+        return len(self.frames) > 0
+
+
+# Function to open a frame source from a --source value
+def open_source(spec, fps=None, max_frames=0, loop=False):
+    spec = str(spec)
+    if spec.isdigit():
+        return VideoSource(int(spec), max_frames=max_frames)  # Cameras pace themselves
+    if spec == 'synthetic':
+        return LandmarkReplaySource(synthetic_landmarks(), fps, max_frames, loop)
+    if spec.startswith(REPLAY_PREFIX):
+        return LandmarkReplaySource(load_replay_frames(spec[len(REPLAY_PREFIX):]), fps, max_frames, loop)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, fps, max_frames, loop)
+    if not os.path.exists(spec):
+        raise FileNotFoundError(f"Frame source not found: {spec}")
+    return VideoSource(spec, fps, max_frames)
+
+
+# Function to add the shared --source/--headless options to a script's argument parser
+def add_source_arguments(parser):
+    parser.add_argument('--source', default='0',
+                        help="Camera index, video file, image directory, 'replay:<path>' or 'synthetic'")
+    parser.add_argument('--headless', action='store_true', help='Run without any window or dialog')
+    parser.add_argument('--source-fps', type=float, default=0, help='Pace non-camera sources to this frame rate')
+    parser.add_argument('--max-frames', type=int, default=0, help='Stop after this many frames (0 = no limit)')
+    parser.add_argument('--loop', action='store_true', help='Loop image directory and replay sources')
+    return parser
@@ -0,0 +1,127 @@
+# grammar.py
+
+import threading
+import time
+import traceback
+from collections import OrderedDict
+import language_tool_python
+from pipeline import DropOldestQueue
+
+# One LanguageTool instance per language for the whole process; the local server takes
+# seconds to start, so it is started once and shared instead of per correction
+_tool_pool = {}
+_tool_pool_lock = threading.Lock()
+
+
+# Function to get the shared LanguageTool for a language, preferring a local server
+# and falling back to the public API when no local server can be started (e.g. no Java)
+def get_tool(language='en-UK', prefer_local=True):
+    with _tool_pool_lock:
+        tool = _tool_pool.get(language)
+        if tool is None:
+            if prefer_local:
+                try:
+                    tool = language_tool_python.LanguageTool(language)
+                    print(f"Grammar correction: local LanguageTool ({language}).")
+                except Exception as e:
+                    print(f"Local LanguageTool unavailable ({e}); using the public API.")
+            if tool is None:
+                tool = language_tool_python.LanguageToolPublicAPI(language)
+            _tool_pool[language] = tool
+        return tool
+
+
+# Function to shut down every pooled LanguageTool
+def close_tools():
+    with _tool_pool_lock:
+        for tool in _tool_pool.values():
+            try:
+                tool.close()
+            except Exception as e:
+                print(f"Failed to close LanguageTool: {e}")
+        _tool_pool.clear()
+
+
+# Corrects sentences on a background thread so the frame loop never waits on LanguageTool
+# Recent corrections are kept in an LRU cache, since the same gesture sentences recur
+class GrammarCorrector:
+    def __init__(self, language='en-UK', cache_size=128, prefer_local=True, timers=None):
+        self.language = language
+        self.timers = timers  # Optional metrics.StageTimers; records 'grammar' per correction
+        self.prefer_local = prefer_local
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.correction_ms = []
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._requests = DropOldestQueue(1)  # Only the newest pending sentence matters
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name='grammar', daemon=True)
+        self._thread.start()
+
+    def _cached(self, text):
+        with self._cache_lock:
+            corrected = self._cache.get(text)
+            if corrected is not None:
+                self._cache.move_to_end(text)
+            return corrected
+
+    def _store(self, text, corrected):
+        with self._cache_lock:
+            self._cache[text] = corrected
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # Function to queue a sentence for correction; `callback(text, corrected)` is called
+    # once it is ready, right away on a cache hit and on the worker thread otherwise
+    def request(self, text, callback):
+        corrected = self._cached(text)
+        if corrected is not None:
+            self.cache_hits += 1
+            callback(text, corrected)
+            return
+        self.cache_misses += 1
+        self._requests.put((text, callback))
+
+    def _run(self):
+        # Start LanguageTool here rather than in __init__, so startup never blocks the caller
+        tool = get_tool(self.language, self.prefer_local)
+        if not self.running:
+            # close() gave up waiting while LanguageTool was starting; shut down what was started
+            close_tools()
+            return
+        while self.running:
+            item = self._requests.get(timeout=0.5)
+            if item is None:
+                continue
+            text, callback = item
+            corrected = self._cached(text)
+            if corrected is None:
+                start = time.perf_counter()
+                try:
+                    corrected = tool.correct(text)
+                except Exception as e:
+                    print(f"An error occurred during grammar correction: {e}")
+                    traceback.print_exc()
+                    continue
+                self.correction_ms.append((time.perf_counter() - start) * 1000.0)
+                if self.timers is not None:
+                    self.timers.record('grammar', self.correction_ms[-1])
+                self._store(text, corrected)
+            callback(text, corrected)
+
+    def summary(self):
+        timing = 'n/a'
+        if self.correction_ms:
+            timing = f"mean {sum(self.correction_ms) / len(self.correction_ms):.0f} ms over {len(self.correction_ms)}"
+        return f"cache hits {self.cache_hits}, misses {self.cache_misses}; corrections: {timing}"
+
+    def close(self):
+        self.running = False
+        self._requests.close()
+        # Don't hang on a slow correction or LanguageTool startup; the worker is a daemon, and
+        # closes the tools itself if it finishes starting LanguageTool after this point
+        self._thread.join(timeout=1.0)
+        close_tools()
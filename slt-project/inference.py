@@ -0,0 +1,205 @@
+# inference.py
+
+import os
+import threading
+import time
+import numpy as np
+from metrics import RollingTimer
+
+# Backends are picked from the model file extension, so a worker can switch to an exported
+# artifact (e.g. SLT_MODEL=exported_models/gesture_recognition_model_float16.tflite) without
+# pulling in full TensorFlow
+BACKENDS = {
+    '.keras': 'keras',
+    '.h5': 'keras',
+    '.tflite': 'tflite',
+    '.onnx': 'onnx'
+}
+
+
+# Shared bookkeeping for every backend: the preallocated single-window input and call latency
+class BaseRunner:
+    backend = None
+
+    def __init__(self, sequence_length=15, num_landmarks=21 * 3 * 2):
+        self.sequence_length = sequence_length
+        self.num_landmarks = num_landmarks
+
+        # Preallocated input for single-window predictions
+        self.input_buffer = np.zeros((1, sequence_length, num_landmarks), dtype=np.float32)
+
+        self.calls = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.latency = RollingTimer()  # Recent call latencies, for percentiles
+        self._lock = threading.Lock()
+
+    # Function to run the backend once per batch size before the first real prediction
+    def warmup(self, batch_sizes=(1,)):
+        start = time.perf_counter()
+        for batch_size in batch_sizes:
+            self._run(np.zeros((batch_size, self.sequence_length, self.num_landmarks), dtype=np.float32))
+        print(f"{self.backend} runner warmed up in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # Function to score an (N, sequence_length, num_landmarks) batch
+    def predict(self, batch):
+        start = time.perf_counter()
+        probabilities = self._run(np.asarray(batch, dtype=np.float32))
+        self._record((time.perf_counter() - start) * 1000.0)
+        return probabilities
+
+    # Function to score one (sequence_length, num_landmarks) window through the preallocated buffer
+    def predict_one(self, window):
+        np.copyto(self.input_buffer[0], window)
+        return self.predict(self.input_buffer)[0]
+
+    def _run(self, batch):
+        raise NotImplementedError
+
+    def _record(self, elapsed_ms):
+        with self._lock:
+            self.calls += 1
+            self.total_ms += elapsed_ms
+            self.last_ms = elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+        self.latency.record(elapsed_ms)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.backend,
+                'calls': self.calls,
+                'last_ms': self.last_ms,
+                'mean_ms': self.total_ms / self.calls if self.calls else 0.0,
+                'max_ms': self.max_ms
+            }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"{stats['backend']}: {stats['calls']} predictions, mean {stats['mean_ms']:.2f} ms, "
+                f"last {stats['last_ms']:.2f} ms, max {stats['max_ms']:.2f} ms")
+
+
+# Wraps a loaded Keras model in a fixed-signature compiled function so single predictions
+# skip the data adapter and step-function setup that model.predict does on every call
+class InferenceRunner(BaseRunner):
+    backend = 'keras'
+
+    def __init__(self, model, sequence_length=15, num_landmarks=21 * 3 * 2, warmup_batch_sizes=(1,)):
+        import tensorflow as tf
+
+        super().__init__(sequence_length, num_landmarks)
+        self.model = model
+
+        # The batch dimension is left open so batched callers reuse the same trace
+        self._forward = tf.function(
+            lambda inputs: self.model(inputs, training=False),
+            input_signature=[tf.TensorSpec([None, sequence_length, num_landmarks], tf.float32)]
+        )
+        self.warmup(warmup_batch_sizes)
+
+    def _run(self, batch):
+        return self._forward(batch).numpy()
+
+
+# Runs an exported .tflite model (float32, float16 or int8-quantized)
+class TFLiteRunner(BaseRunner):
+    backend = 'tflite'
+
+    def __init__(self, model_path, sequence_length=15, num_landmarks=21 * 3 * 2, warmup_batch_sizes=(1,)):
+        super().__init__(sequence_length, num_landmarks)
+
+        # Prefer the standalone runtime so TensorFlow is not imported at all
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self._make_interpreter = lambda: Interpreter(model_path=model_path)
+        self.interpreter = self._make_interpreter()
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        # One interpreter per batch size, so tensors are allocated once per batch shape
+        # instead of being reallocated whenever single windows and batches alternate
+        self._interpreters = {1: self.interpreter}
+        self._resizable = True  # False once the graph turns out to be fixed at batch 1
+        # Interpreters are not thread-safe, and app.py predicts from several threads
+        self._interpreter_lock = threading.Lock()
+        self.warmup(warmup_batch_sizes)
+
+    # Function to get an interpreter allocated for a batch size, or None if the graph
+    # cannot be resized
+    def _interpreter_for(self, batch_size):
+        interpreter = self._interpreters.get(batch_size)
+        if interpreter is not None or not self._resizable:
+            return interpreter
+        try:
+            interpreter = self._make_interpreter()
+            interpreter.resize_tensor_input(
+                self._input['index'], [batch_size, self.sequence_length, self.num_landmarks])
+            interpreter.allocate_tensors()
+            # Some graphs resize but fail on invoke (e.g. a reshape baked in at batch 1)
+            interpreter.set_tensor(self._input['index'], np.zeros(
+                (batch_size, self.sequence_length, self.num_landmarks), dtype=np.float32))
+            interpreter.invoke()
+        except Exception as e:
+            print(f"TFLite model cannot be resized to batch {batch_size} ({e}); scoring row by row.")
+            self._resizable = False
+            return None
+        self._interpreters[batch_size] = interpreter
+        return interpreter
+
+    def _run(self, batch):
+        if not len(batch):
+            return np.empty((0, self._output['shape'][-1]), dtype=np.float32)
+        with self._interpreter_lock:
+            # Score the whole batch in one invoke
+            interpreter = self._interpreter_for(len(batch))
+            if interpreter is not None:
+                interpreter.set_tensor(self._input['index'], batch)
+                interpreter.invoke()
+                return interpreter.get_tensor(self._output['index']).copy()
+
+            # Graphs fixed at batch 1 are scored row by row
+            outputs = []
+            for row in range(len(batch)):
+                self.interpreter.set_tensor(self._input['index'], batch[row:row + 1])
+                self.interpreter.invoke()
+                outputs.append(self.interpreter.get_tensor(self._output['index'])[0])
+            return np.stack(outputs)
+
+
+# Runs an exported .onnx model through onnxruntime
+class ONNXRunner(BaseRunner):
+    backend = 'onnx'
+
+    def __init__(self, model_path, sequence_length=15, num_landmarks=21 * 3 * 2, warmup_batch_sizes=(1,)):
+        import onnxruntime as ort
+
+        super().__init__(sequence_length, num_landmarks)
+        self.session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+        self._input_name = self.session.get_inputs()[0].name
+        self.warmup(warmup_batch_sizes)
+
+    def _run(self, batch):
+        return self.session.run(None, {self._input_name: batch})[0]
+
+
+# Function to load a model file with the backend matching its extension
+def load_runner(model_path, sequence_length=15, num_landmarks=21 * 3 * 2, warmup_batch_sizes=(1,)):
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Trained model file not found at {model_path}")
+
+    backend = BACKENDS.get(os.path.splitext(model_path)[1].lower())
+    if backend == 'tflite':
+        return TFLiteRunner(model_path, sequence_length, num_landmarks, warmup_batch_sizes)
+    if backend == 'onnx':
+        return ONNXRunner(model_path, sequence_length, num_landmarks, warmup_batch_sizes)
+    if backend == 'keras':
+        import tensorflow as tf
+        model = tf.keras.models.load_model(model_path, compile=False)
+        return InferenceRunner(model, sequence_length, num_landmarks, warmup_batch_sizes)
+    raise ValueError(f"Unsupported model format '{model_path}'. Expected one of {list(BACKENDS)}")
@@ -0,0 +1,39 @@
+# landmark_extraction.py
+
+import struct
+from itertools import chain
+from operator import attrgetter
+import numpy as np
+
+# Constants
+NUM_HAND_LANDMARKS = 21
+NUM_LANDMARKS_PER_HAND = NUM_HAND_LANDMARKS * 3  # 21 landmarks * 3 coordinates
+NUM_LANDMARKS = NUM_LANDMARKS_PER_HAND * 2       # For both hands
+
+# Slot each MediaPipe handedness label is written to in the (num_landmarks,) frame
+HAND_SLOTS = {'Left': 0, 'Right': 1}
+
+# One hand's coordinates are packed as float32 straight into the frame's buffer, and the
+# x/y/z reads run through attrgetter/chain so no per-landmark Python lists are built
+_HAND_STRUCT = struct.Struct(f'={NUM_LANDMARKS_PER_HAND}f')
+_HAND_BYTES = _HAND_STRUCT.size
+_get_xyz = attrgetter('x', 'y', 'z')
+
+
+# Function to write both hands of a MediaPipe result into a (num_landmarks,) float32 frame
+# Left hand goes to [0:63], right hand to [63:126]; a missing hand stays zero-filled.
+# Returns the frame, or None if no hands were detected
+def extract_landmarks(results, out=None):
+    if not (results.multi_hand_landmarks and results.multi_handedness):
+        return None
+
+    if out is None:
+        out = np.empty(NUM_LANDMARKS, dtype=np.float32)
+    out.fill(0.0)
+
+    for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+        slot = HAND_SLOTS.get(handedness.classification[0].label)
+        if slot is None:
+            continue
+        _HAND_STRUCT.pack_into(out, slot * _HAND_BYTES, *chain.from_iterable(map(_get_xyz, hand_landmarks.landmark)))
+    return out
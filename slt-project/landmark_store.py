@@ -0,0 +1,248 @@
+# landmark_store.py
+
+import os
+import json
+import time
+import numpy as np
+
+# Constants
+PACKED_PATH = 'MP_Data_packed'  # Directory holding the packed shard and its index
+SHARD_FILE = 'landmarks.f32'     # Contiguous float32 rows of shape (sequence_length, num_landmarks)
+INDEX_FILE = 'index.json'        # Label/offset index for the rows in the shard
+SEQUENCE_LENGTH = 15
+NUM_LANDMARKS = 21 * 3 * 2       # 21 landmarks * 3 coordinates * 2 hands
+
+
+# Function to create an empty index for a new shard
+def _empty_index(sequence_length, num_landmarks):
+    return {
+        'version': 1,
+        'dtype': 'float32',
+        'sequence_length': sequence_length,
+        'num_landmarks': num_landmarks,
+        'count': 0,
+        'gestures': [],
+        'records': [],
+        'rejected': {},              # Files that failed validation, keyed on path with their mtime/size
+        'read_seconds_per_file': 0.0
+    }
+
+
+# Function to load the index of a packed shard (None if it has not been packed yet)
+def load_index(packed_path=PACKED_PATH):
+    index_path = os.path.join(packed_path, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Function to write the index atomically so a crash never leaves it half-written
+def _write_index(packed_path, index):
+    index_path = os.path.join(packed_path, INDEX_FILE)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+
+
+# Function to get the cache key (mtime, size) of a source file
+def _file_stat(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+# Function to register a record (gesture label + row offset) in the index
+def _add_record(index, gesture, source, stat=None):
+    if gesture not in index['gestures']:
+        index['gestures'].append(gesture)
+    index['records'].append({
+        'gesture': gesture,
+        'label': index['gestures'].index(gesture),
+        'offset': index['count'],
+        'source': os.path.normpath(source) if source else None,
+        'stat': stat
+    })
+    index['count'] += 1
+
+
+# Function to validate a landmark sequence before it is written to the shard
+def _check_sequence(landmarks_sequence, sequence_length, num_landmarks):
+    return landmarks_sequence.shape == (sequence_length, num_landmarks)
+
+
+# Function to list every landmarks.npy file in the MP_Data/<gesture>/<seq>/ tree
+def _walk_sequences(data_path):
+    gestures = [
+        gesture for gesture in sorted(os.listdir(data_path))
+        if os.path.isdir(os.path.join(data_path, gesture))
+    ]
+    for gesture in gestures:
+        gesture_path = os.path.join(data_path, gesture)
+        for sequence in sorted(os.listdir(gesture_path)):
+            sequence_path = os.path.join(gesture_path, sequence, 'landmarks.npy')
+            if os.path.exists(sequence_path):
+                yield gesture, os.path.normpath(sequence_path)
+            else:
+                print(f"File not found: {sequence_path}")
+
+
+# Function to bring the shard up to date with the MP_Data tree
+# Only files that are new or whose mtime/size changed are opened; everything else
+# is reused from the shard, and files that failed validation are remembered
+def sync_dataset(data_path, packed_path=PACKED_PATH,
+                 sequence_length=SEQUENCE_LENGTH, num_landmarks=NUM_LANDMARKS, rebuild=False):
+    start_time = time.perf_counter()
+    os.makedirs(packed_path, exist_ok=True)
+
+    row_bytes = sequence_length * num_landmarks * np.dtype(np.float32).itemsize
+    shard_path = os.path.join(packed_path, SHARD_FILE)
+
+    index = None if rebuild else load_index(packed_path)
+    if (index is None or not os.path.exists(shard_path)
+            or index['sequence_length'] != sequence_length
+            or index['num_landmarks'] != num_landmarks):
+        index = _empty_index(sequence_length, num_landmarks)
+    rejected = index.get('rejected', {})
+    records_by_source = {record['source']: record for record in index['records'] if record['source']}
+
+    # Compare every file on disk against the cache using only os.stat
+    cached_sources = set()
+    changed_files = []
+    seen_sources = set()
+    skipped_bad = 0
+    for gesture, sequence_path in _walk_sequences(data_path):
+        seen_sources.add(sequence_path)
+        stat = _file_stat(sequence_path)
+        record = records_by_source.get(sequence_path)
+        if record is not None and record.get('stat') == stat:
+            cached_sources.add(sequence_path)
+        elif sequence_path in rejected and rejected[sequence_path]['stat'] == stat:
+            skipped_bad += 1
+        else:
+            changed_files.append((gesture, sequence_path, stat))
+
+    # Keep rows that are still valid; rows appended without a source file are always kept
+    kept_records = [
+        record for record in index['records']
+        if record['source'] is None or record['source'] in cached_sources
+    ]
+    removed = len(index['records']) - len(kept_records)
+    rejected = {path: entry for path, entry in rejected.items() if path in seen_sources}
+
+    if removed == 0 and os.path.exists(shard_path):
+        # Nothing was dropped, so new rows can simply be appended
+        packed = index
+        shard = open(shard_path, 'ab')
+        shard.truncate(packed['count'] * row_bytes)
+    else:
+        # Rows were dropped or replaced, so compact the kept rows into a new shard
+        packed = _empty_index(sequence_length, num_landmarks)
+        packed['read_seconds_per_file'] = index.get('read_seconds_per_file', 0.0)
+        shard = open(shard_path + '.tmp', 'wb')
+        if kept_records:
+            old_rows, _ = open_shard(packed_path)
+            for record in kept_records:
+                shard.write(old_rows[record['offset']].tobytes())
+                _add_record(packed, record['gesture'], record['source'], record.get('stat'))
+            del old_rows
+
+    # Read, validate and stream only the new or changed files into the shard
+    read_start = time.perf_counter()
+    with shard:
+        for gesture, sequence_path, stat in changed_files:
+            landmarks_sequence = np.asarray(np.load(sequence_path), dtype=np.float32)
+            if not _check_sequence(landmarks_sequence, sequence_length, num_landmarks):
+                print(f"Sequence length mismatch in {sequence_path}")
+                rejected[sequence_path] = {'stat': stat, 'shape': list(landmarks_sequence.shape)}
+                continue
+            rejected.pop(sequence_path, None)
+            shard.write(np.ascontiguousarray(landmarks_sequence).tobytes())
+            _add_record(packed, gesture, sequence_path, stat)
+    read_seconds = time.perf_counter() - read_start
+
+    if changed_files:
+        packed['read_seconds_per_file'] = read_seconds / len(changed_files)
+    packed['rejected'] = rejected
+
+    if packed is not index:
+        # The old index points at offsets in the old shard, so remove it before the swap.
+        # A crash before the new index is written then leaves no index, and the next sync
+        # rebuilds instead of reading rows at the wrong offsets
+        index_path = os.path.join(packed_path, INDEX_FILE)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        os.replace(shard_path + '.tmp', shard_path)
+    _write_index(packed_path, packed)
+
+    # Report the cache hits; the time saved is only an estimate, from the mean time to read,
+    # validate and append a changed file in the latest sync that had any
+    print(f"Dataset cache: {len(cached_sources)} cached, {len(changed_files)} new or changed, "
+          f"{removed} removed, {skipped_bad} known-bad skipped "
+          f"({packed['count']} sequences in {time.perf_counter() - start_time:.2f}s)")
+    if packed['read_seconds_per_file'] and (cached_sources or skipped_bad):
+        saved_seconds = (len(cached_sources) + skipped_bad) * packed['read_seconds_per_file']
+        print(f"Dataset cache: roughly {saved_seconds:.2f}s of file reads avoided (estimated at "
+              f"{packed['read_seconds_per_file'] * 1000:.2f} ms per file, not measured)")
+    return packed
+
+
+# Function to rebuild the shard from scratch out of the MP_Data tree
+def pack_dataset(data_path, packed_path=PACKED_PATH,
+                 sequence_length=SEQUENCE_LENGTH, num_landmarks=NUM_LANDMARKS):
+    return sync_dataset(data_path, packed_path, sequence_length, num_landmarks, rebuild=True)
+
+
+# Function to append a single landmark sequence to the shard
+def append_sequence(gesture, landmarks_sequence, source=None, packed_path=PACKED_PATH,
+                    sequence_length=SEQUENCE_LENGTH, num_landmarks=NUM_LANDMARKS):
+    landmarks_sequence = np.asarray(landmarks_sequence, dtype=np.float32)
+    if not _check_sequence(landmarks_sequence, sequence_length, num_landmarks):
+        print(f"Sequence length mismatch for gesture '{gesture}', not appended to shard.")
+        return False
+
+    os.makedirs(packed_path, exist_ok=True)
+    index = load_index(packed_path) or _empty_index(sequence_length, num_landmarks)
+    row_bytes = sequence_length * num_landmarks * np.dtype(np.float32).itemsize
+
+    shard_path = os.path.join(packed_path, SHARD_FILE)
+    with open(shard_path, 'ab') as shard:
+        # Drop any bytes left behind by an append that crashed before its index was written
+        shard.truncate(index['count'] * row_bytes)
+        shard.write(np.ascontiguousarray(landmarks_sequence).tobytes())
+
+    # Record the source file's mtime/size so the next sync treats it as cached
+    stat = _file_stat(source) if source and os.path.exists(source) else None
+    _add_record(index, gesture, source, stat)
+    _write_index(packed_path, index)
+    return True
+
+
+# Function to memory-map the shard as an (N, sequence_length, num_landmarks) array
+def open_shard(packed_path=PACKED_PATH):
+    index = load_index(packed_path)
+    if index is None:
+        raise FileNotFoundError(f"No packed dataset found at {packed_path}")
+
+    shape = (index['count'], index['sequence_length'], index['num_landmarks'])
+    if index['count'] == 0:
+        return np.empty(shape, dtype=np.float32), index
+
+    X = np.memmap(os.path.join(packed_path, SHARD_FILE), dtype=np.float32, mode='r', shape=shape)
+    return X, index
+
+
+# Function to memory-map the shard and label its rows with indices into `gestures`
+def load_labeled(gestures, packed_path=PACKED_PATH):
+    X, index = open_shard(packed_path)
+
+    # Map the gesture names stored in the index onto the caller's class indices
+    label_map = {gesture: idx for idx, gesture in enumerate(gestures)}
+    record_gestures = [record['gesture'] for record in index['records']]
+    keep = np.array([gesture in label_map for gesture in record_gestures], dtype=bool)
+    y = np.array([label_map[gesture] for gesture in record_gestures if gesture in label_map], dtype=int)
+
+    # Only copy out of the memory map if some rows belong to gestures that are not requested
+    if not keep.all():
+        X = X[keep]
+    return X, y
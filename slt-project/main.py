@@ -4,48 +4,47 @@ import cv2
 import numpy as np
 import os
 import mediapipe as mp
-import tensorflow as tf
 import sys
-import language_tool_python
 import traceback  # For detailed exception information
-import pyttsx3  # Added for text-to-speech
+from inference import load_runner  # Compiled, warmed-up model wrapper
+from ring_buffer import LandmarkRingBuffer  # Preallocated rolling window
+from landmark_extraction import extract_landmarks  # Vectorized landmark packing
+from prediction_smoothing import ProbabilitySmoother, WordLatencyTracker
+from grammar import GrammarCorrector  # Background, cached grammar correction
+from speech import SpeechWorker, SPEECH_CACHE_PATH  # Single text-to-speech thread
+from quality_governor import QualityGovernor, detection_input, TARGET_FPS
+from motion_gate import MotionGate, IdleController, MOTION_THRESHOLD, IDLE_AFTER_SECONDS, IDLE_FPS
+from metrics import StageTimers  # Rolling p50/p95/p99 per stage
+from pipeline import DropOldestQueue, LatestFrameCapture, Stage, StageStats, pipeline_summary
+from frame_sources import open_source, add_source_arguments, REPLAY_CANVAS_SHAPE
+import window_utils  # Window helpers; tkinter/pywin32 are only imported when a window is shown
+import argparse
 import threading  # Added for threading
-import tkinter as tk  # For getting screen size
-import win32gui  # Added for window management
 import time  # Added for delays
 
+# Command line options; with no arguments this is the usual camera + window recognizer
+parser = add_source_arguments(argparse.ArgumentParser(description='Live sign language recognizer.'))
+parser.add_argument('--mute', action='store_true', help='Disable text-to-speech (implied by --headless)')
+args = parser.parse_args()
+window_utils.set_headless(args.headless)
+
 # Configure standard output to use UTF-8 encoding
 sys.stdout.reconfigure(encoding='utf-8')
 
 # Suppress TensorFlow logging
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # Suppress TensorFlow logging
 
-# Initialize text-to-speech engine
-engine = pyttsx3.init()
-
-# Adjust speech rate to make it faster
-rate = engine.getProperty('rate')
-engine.setProperty('rate', rate + 50)  # Increase rate by 50 words per minute
-
-# Function to handle speech in a separate thread
-def speak_text(text):
-    def run_speech():
-        engine.say(text)
-        engine.runAndWait()
-    t = threading.Thread(target=run_speech)
-    t.start()
-
 # Get the directory where main.py is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
 # Construct the absolute path to the model file
-model_path = os.path.join(script_dir, 'gesture_recognition_model.keras')
+# Set SLT_MODEL to a .tflite or .onnx export to run without the Keras backend
+model_path = os.environ.get('SLT_MODEL', os.path.join(script_dir, 'gesture_recognition_model.keras'))
 
-# Load the trained model
+# Load the trained model behind a compiled, warmed-up inference runner
 try:
-    model = tf.keras.models.load_model(model_path, compile=False)
-    print(f"Model loaded successfully.")
-    print(f"Model input shape: {model.input_shape}")
+    runner = load_runner(model_path)
+    print(f"Model loaded successfully ({runner.backend} backend).")
 except Exception as e:
     print(f"An error occurred while loading the model: {e}")
     traceback.print_exc()
@@ -66,6 +65,10 @@ gestures = np.array([
 ])
 print(f"Gestures: {gestures}")
 
+# Start the text-to-speech worker; it pre-renders every gesture label so words play instantly
+speech = SpeechWorker(gestures, cache_path=os.path.join(script_dir, SPEECH_CACHE_PATH),
+                      enabled=not (args.mute or args.headless))
+
 # Number of frames in each sequence
 sequence_length = 15
 
@@ -73,205 +76,365 @@ sequence_length = 15
 num_landmarks_per_hand = 21 * 3
 num_landmarks = num_landmarks_per_hand * 2  # For both hands
 
+# Recognition mode:
+#   'stride' - predict every PREDICTION_STRIDE hand frames on overlapping windows and smooth
+#              the probabilities over recent windows before applying the threshold
+#   'reset'  - predict on non-overlapping windows, clearing the window after every prediction
+RECOGNITION_MODE = os.environ.get('SLT_RECOGNITION_MODE', 'stride')
+PREDICTION_STRIDE = int(os.environ.get('SLT_PREDICTION_STRIDE', 5))
+SMOOTHING_METHOD = os.environ.get('SLT_SMOOTHING', 'ema')  # 'ema', 'mean', 'vote' or 'none'
+SMOOTHING_ALPHA = 0.5   # Weight of the newest window for 'ema'
+SMOOTHING_WINDOW = 3    # Number of recent windows for 'mean' and 'vote'
+
+if RECOGNITION_MODE == 'reset':
+    prediction_stride = sequence_length
+    smoother = ProbabilitySmoother('none')
+else:
+    prediction_stride = PREDICTION_STRIDE
+    smoother = ProbabilitySmoother(SMOOTHING_METHOD, SMOOTHING_ALPHA, SMOOTHING_WINDOW)
+print(f"Recognition mode: {RECOGNITION_MODE} (predicting every {prediction_stride} hand frames)")
+
+# Skip model calls on windows that barely moved since the last call, and drop the
+# capture/detection rate after a while without hands (woken by the next hand frame)
+motion_gate = MotionGate(float(os.environ.get('SLT_MOTION_THRESHOLD', MOTION_THRESHOLD)))
+idle = IdleController(
+    idle_after=float(os.environ.get('SLT_IDLE_AFTER_S', IDLE_AFTER_SECONDS)),
+    idle_fps=float(os.environ.get('SLT_IDLE_FPS', IDLE_FPS)))
+last_probabilities = None  # Raw model output reused while the motion gate skips calls
+active_capture_fps = 0.0   # Capture rate just before entering idle, for the savings estimate
+
 # Initialize MediaPipe Hands
 mp_hands = mp.solutions.hands
 
-# Initialize the grammar correction tool
-tool = language_tool_python.LanguageToolPublicAPI('en-UK')
-
-# Access the camera
-cap = cv2.VideoCapture(0)
+# Adaptive quality: steps detection resolution, MediaPipe model_complexity and prediction
+# cadence down when frames fall behind the budget, and back up when there is headroom.
+# Display always stays at the camera's full resolution
+governor = QualityGovernor(
+    target_fps=float(os.environ.get('SLT_TARGET_FPS', TARGET_FPS)),
+    enabled=os.environ.get('SLT_ADAPTIVE_QUALITY', '1') != '0')
+hands = None             # Rebuilt on the landmark thread when model_complexity changes
+hands_complexity = None
+
+# Rolling per-stage latency: capture, color, hands, landmarks, inference, grammar, tts, render
+timers = StageTimers()
+SHOW_HUD = os.environ.get('SLT_HUD', '0') == '1'  # Toggle at runtime with 'h'
+HUD_REFRESH_INTERVAL = 0.5  # Seconds between HUD text updates
+
+# Initialize the grammar correction worker (local LanguageTool, falling back to the public API)
+# Correction is triggered from the keyboard, so there is nothing to start when headless
+grammar = None if args.headless else GrammarCorrector('en-UK', timers=timers)
+
+# Open the frame source (camera by default)
+try:
+    cap = open_source(args.source, fps=args.source_fps, max_frames=args.max_frames, loop=args.loop)
+except Exception as e:
+    print(f"Cannot open frame source '{args.source}': {e}")
+    exit()
 if not cap.isOpened():
     print("Cannot access camera.")
     exit()
 
 # Create and configure the OpenCV window
 window_name = 'Hand Gesture Recognition'
-cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-
-# Get screen size using tkinter
-root = tk.Tk()
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
-root.destroy()
-
-# Set window size (optional)
 window_width = 800
 window_height = 600
-cv2.resizeWindow(window_name, window_width, window_height)
-
-# Calculate top-left corner to center the window
-x = (screen_width // 2) - (window_width // 2)
-y = (screen_height // 2) - (window_height // 2)
-
-# Move window to center
-cv2.moveWindow(window_name, x, y)
+if not args.headless:
+    window_utils.create_window(window_name, window_width, window_height)
 
-# Function to bring window to front
-def bring_window_to_front(window_title):
-    try:
-        hwnd = win32gui.FindWindow(None, window_title)
-        if hwnd:
-            win32gui.SetForegroundWindow(hwnd)
-    except Exception as e:
-        print(f"Failed to bring window to front: {e}")
-
-# Allow some time for the window to initialize
-time.sleep(0.5)
-bring_window_to_front(window_name)
-
-sequence = []
-predicted_gesture = ''
-last_prediction = ''
-sentence = []
-grammar_result = ''
+sequence = LandmarkRingBuffer(sequence_length, num_landmarks)  # Last 'sequence_length' frames
+frames_since_prediction = 0
+word_latency = WordLatencyTracker()  # Hand onset -> first word, and word -> word timings
 threshold = 0.8  # Confidence threshold
 
-with mp_hands.Hands(
-        max_num_hands=2,
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5) as hands:
-    print("Press 'q' to quit.")
-
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            print("Failed to capture image.")
+# Recognition state shared between the inference stage and the render loop
+state = {'predicted_gesture': '', 'last_prediction': '', 'sentence': [], 'grammar_result': ''}
+state_lock = threading.Lock()
+reset_requested = threading.Event()  # Set by the render loop, handled on the inference thread
+
+# Pipeline configuration: capture -> landmark -> inference -> render, connected by
+# bounded drop-oldest queues so a slow stage always works on the newest camera frame.
+# Finite sources block instead, so every frame of a file or replay is processed
+PIPELINE_QUEUE_SIZE = int(os.environ.get('SLT_PIPELINE_QUEUE_SIZE', 2))
+PIPELINE_STATS_INTERVAL = 10.0  # Seconds between pipeline stats lines
+
+
+# Function to run MediaPipe on the newest camera frame (landmark thread only)
+def detect_landmarks(item):
+    global hands, hands_complexity
+    frame_id, captured_at, frame = item
+
+    # Landmark replay sources skip MediaPipe; an all-zero frame means no hands in view
+    if cap.landmarks_only:
+        with timers.time('landmarks'):
+            landmarks = frame.copy() if frame.any() else None
+        canvas = None if args.headless else np.zeros(REPLAY_CANVAS_SHAPE, dtype=np.uint8)
+        return canvas, None, landmarks, captured_at
+
+    level = governor.level
+
+    # model_complexity is fixed per Hands instance, so switching levels rebuilds it
+    if level['model_complexity'] != hands_complexity:
+        if hands is not None:
+            hands.close()
+        hands = mp_hands.Hands(
+            max_num_hands=2,
+            model_complexity=level['model_complexity'],
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5)
+        hands_complexity = level['model_complexity']
+
+    with timers.time('color'):
+        # Flip the frame horizontally for a later selfie-view display
+        frame = cv2.flip(frame, 1)
+
+        # Convert the (possibly downscaled) BGR image to RGB
+        image_rgb = cv2.cvtColor(detection_input(frame, level['detection_width']), cv2.COLOR_BGR2RGB)
+        image_rgb.flags.writeable = False  # Improve performance
+
+    # Process the image and find hand landmarks
+    with timers.time('hands'):
+        results = hands.process(image_rgb)
+
+    # A fresh array per frame, since it is handed to another thread
+    with timers.time('landmarks'):
+        landmarks = extract_landmarks(results)
+    return frame, results, landmarks, captured_at
+
+
+# Function to update the window and run the model on it (inference thread only)
+def recognize(item):
+    global frames_since_prediction, last_probabilities, active_capture_fps
+    frame, results, landmarks, captured_at = item
+
+    if reset_requested.is_set():
+        reset_requested.clear()
+        sequence.clear()
+        smoother.reset()
+        motion_gate.reset()
+        frames_since_prediction = 0
+
+    # Leave idle mode on the first hand frame, enter it after a while without hands
+    if idle.update(landmarks is not None):
+        if idle.is_idle:
+            active_capture_fps = capture.stats.throughput()
+        print(f"{'Idle' if idle.is_idle else 'Active'} mode.")
+        capture.set_interval(idle.capture_interval())
+
+    if landmarks is not None:
+        sequence.append(landmarks)
+        frames_since_prediction += 1
+        word_latency.hand_frame()
+
+        # Perform prediction once the window is full and enough new frames have arrived
+        if sequence.is_full() and frames_since_prediction >= prediction_stride * governor.level['stride_scale']:
+            frames_since_prediction = 0
+            # An unchanged window would score the same; feed the smoother the previous output instead
+            if last_probabilities is None or motion_gate.should_predict(sequence.view()):
+                with timers.time('inference'):
+                    last_probabilities = runner.predict(sequence.window())[0]
+            probabilities = smoother.update(last_probabilities)
+            prediction = np.argmax(probabilities)
+            confidence = probabilities[prediction]
+
+            with state_lock:
+                if confidence > threshold:
+                    state['predicted_gesture'] = gestures[prediction]
+                    if state['predicted_gesture'] != state['last_prediction']:
+                        state['sentence'].append(state['predicted_gesture'])
+                        state['last_prediction'] = state['predicted_gesture']
+                        word_latency.word_accepted()
+
+                        # Headless runs have no window or speech, so report each word here
+                        if args.headless:
+                            print(f"Word: {state['predicted_gesture']} ({confidence:.2f})")
+
+                        # Queue text-to-speech for the predicted gesture
+                        with timers.time('tts'):
+                            speech.say_word(state['predicted_gesture'])
+
+                else:
+                    state['predicted_gesture'] = 'Unknown'
+
+                # Limit the sentence length to a reasonable number
+                if len(state['sentence']) > 7:
+                    state['sentence'] = state['sentence'][-7:]
+
+            # Reset sequence after prediction (overlapping windows keep it in stride mode)
+            if RECOGNITION_MODE == 'reset':
+                sequence.clear()
+    else:
+        # When no hands are detected, only restart the latency measurement
+        word_latency.no_hands()
+
+    # Capture -> recognized latency drives the quality level
+    governor.observe((time.perf_counter() - captured_at) * 1000.0)
+    return frame, results
+
+
+# Function to show and speak a grammar correction once the worker has it
+def grammar_ready(text, corrected):
+    with state_lock:
+        # Ignore corrections for a sentence that changed or was reset in the meantime
+        if ' '.join(state['sentence']) != text:
+            return
+        state['grammar_result'] = corrected
+    print(f"Grammar corrected sentence: {corrected}")
+
+    # Speak the grammar corrected sentence, superseding any words still queued
+    with timers.time('tts'):
+        speech.say_sentence(corrected)
+
+
+# Function to stop reading frames if a worker stage fails; the render loop ends once the
+# failed stage closes its output queue
+def stage_failed(error):
+    capture.running = False
+
+
+print("Press 'q' to quit.")
+
+# MediaPipe runs on the landmark thread only; rendering and every cv2 GUI call
+# stay on this (main) thread
+capture = LatestFrameCapture(cap, timers=timers)
+landmark_queue = DropOldestQueue(PIPELINE_QUEUE_SIZE, block=capture.lossless)
+render_queue = DropOldestQueue(PIPELINE_QUEUE_SIZE, block=capture.lossless)
+capture.start()
+stages = [
+    Stage('landmark', detect_landmarks, capture, landmark_queue, on_error=stage_failed).start(),
+    Stage('inference', recognize, landmark_queue, render_queue, on_error=stage_failed).start()
+]
+render_stats = StageStats()
+last_stats_print = time.perf_counter()
+hud_lines = []
+last_hud_update = 0.0
+
+# Runs until the render queue is closed: after a finite source ends and every stage has
+# drained its queue, or after a stage fails
+while not render_queue.finished:
+    item = render_queue.get(timeout=0.1)
+    if item is None:
+        # Keep the window responsive while waiting for the next frame
+        if not args.headless and cv2.waitKey(1) & 0xFF == ord('q'):
             break
+        continue
 
-        try:
-            # Flip the frame horizontally for a later selfie-view display
-            frame = cv2.flip(frame, 1)
-
-            # Convert the BGR image to RGB
-            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image_rgb.flags.writeable = False  # Improve performance
-
-            # Process the image and find hand landmarks
-            results = hands.process(image_rgb)
-
-            # Set the flag to true to draw landmarks on the image
-            image_rgb.flags.writeable = True
-            image = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
-
-            if results.multi_hand_landmarks and results.multi_handedness:
-                # Prepare dictionaries to hold landmarks for left and right hands
-                hand_landmarks_dict = {'Left': None, 'Right': None}
-
-                # Loop through detected hands
-                for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                    # Get the handedness label
-                    hand_label = results.multi_handedness[idx].classification[0].label
-                    # Extract landmark coordinates
-                    landmarks = []
-                    for lm in hand_landmarks.landmark:
-                        landmarks.extend([lm.x, lm.y, lm.z])
-                    hand_landmarks_dict[hand_label] = landmarks
-
-                # Prepare combined landmarks for both hands
-                # If a hand is not present, fill with zeros
-                left_hand_landmarks = hand_landmarks_dict['Left'] or [0.0] * num_landmarks_per_hand
-                right_hand_landmarks = hand_landmarks_dict['Right'] or [0.0] * num_landmarks_per_hand
-                combined_landmarks = left_hand_landmarks + right_hand_landmarks
-
-                sequence.append(combined_landmarks)
-                sequence = sequence[-sequence_length:]  # Keep the last 'sequence_length' frames
-
-                # Draw hand landmarks on the image (optional)
-                for hand_landmarks in results.multi_hand_landmarks:
-                    mp.solutions.drawing_utils.draw_landmarks(
-                        image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-
-                # Perform prediction if we have enough frames
-                if len(sequence) == sequence_length:
-                    input_data = np.expand_dims(sequence, axis=0)  # Shape: (1, sequence_length, num_landmarks)
-                    input_data = np.array(input_data, dtype=np.float32)
-
-                    # Print input data shape and type for debugging
-                    # print(f"Input data shape: {input_data.shape}, dtype: {input_data.dtype}")
-
-                    probabilities = model.predict(input_data, verbose=0)[0]
-                    prediction = np.argmax(probabilities)
-                    confidence = probabilities[prediction]
-                    print(f"Predicted gesture: {gestures[prediction]}, Confidence: {confidence}")
-
-                    if confidence > threshold:
-                        predicted_gesture = gestures[prediction]
-                        if predicted_gesture != last_prediction:
-                            sentence.append(predicted_gesture)
-                            last_prediction = predicted_gesture
-
-                            # Add text-to-speech for the predicted gesture in a separate thread
-                            speak_text(predicted_gesture)
-
-                    else:
-                        predicted_gesture = 'Unknown'
-
-                    # Reset sequence after prediction
-                    sequence = []
-            else:
-                # When no hands are detected, do nothing
-                pass  # Removed the 'No hands detected' message
-
-            # Limit the sentence length to a reasonable number
-            if len(sentence) > 7:
-                sentence = sentence[-7:]
-
-            # Check if 'Enter' key is pressed for grammar correction
-            key = cv2.waitKey(1) & 0xFF
-            if key == 13:  # Enter key
-                text = ' '.join(sentence)
-                grammar_result = tool.correct(text)
-                print(f"Grammar corrected sentence: {grammar_result}")
-
-                # Speak the grammar corrected sentence in a separate thread
-                speak_text(grammar_result)
-
-            # Check if 'Spacebar' is pressed to reset
-            if key == ord(' '):  # Spacebar key
-                sentence = []
-                grammar_result = ''
-                last_prediction = ''
-                sequence = []
-
-            # Display the sentence on the image
-            if grammar_result:
+    try:
+        render_start = time.perf_counter()
+        image, results = item
+
+        if args.headless:
+            # Nothing to draw; count the frame and report throughput periodically
+            render_stats.record(time.perf_counter() - render_start)
+            if render_start - last_stats_print >= PIPELINE_STATS_INTERVAL:
+                last_stats_print = render_start
+                print(f"Pipeline: {pipeline_summary(capture, stages, {'landmark': landmark_queue, 'render': render_queue})}"
+                      f" | render {render_stats.throughput():.1f}/s")
+            continue
+
+        # Draw hand landmarks on the image (optional)
+        if results is not None and results.multi_hand_landmarks:
+            for hand_landmarks in results.multi_hand_landmarks:
+                mp.solutions.drawing_utils.draw_landmarks(
+                    image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+
+        # Check if 'Enter' key is pressed for grammar correction
+        key = cv2.waitKey(1) & 0xFF
+        if key == 13:  # Enter key
+            with state_lock:
+                text = ' '.join(state['sentence'])
+            # Returns immediately; the overlay picks up the result when it is ready
+            grammar.request(text, grammar_ready)
+
+        # Check if 'Spacebar' is pressed to reset
+        if key == ord(' '):  # Spacebar key
+            with state_lock:
+                state['sentence'] = []
+                state['grammar_result'] = ''
+                state['last_prediction'] = ''
+            reset_requested.set()
+
+        with state_lock:
+            predicted_gesture = state['predicted_gesture']
+            if state['grammar_result']:
                 # Display grammar corrected sentence
-                text_to_display = grammar_result
+                text_to_display = state['grammar_result']
             else:
                 # Display the current sentence
-                text_to_display = ' '.join(sentence)
+                text_to_display = ' '.join(state['sentence'])
 
-            # Calculate text size and position
-            textsize = cv2.getTextSize(text_to_display, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)[0]
-            text_X_coord = (image.shape[1] - textsize[0]) // 2
+        # Calculate text size and position
+        textsize = cv2.getTextSize(text_to_display, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)[0]
+        text_X_coord = (image.shape[1] - textsize[0]) // 2
 
-            # Draw the sentence on the image
-            cv2.putText(
-                image, text_to_display, (text_X_coord, 470),
-                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
+        # Draw the sentence on the image
+        cv2.putText(
+            image, text_to_display, (text_X_coord, 470),
+            cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
 
-            # Display the predicted gesture on the frame (optional)
-            if predicted_gesture and predicted_gesture != 'Unknown':
+        # Display the predicted gesture on the frame (optional)
+        if predicted_gesture and predicted_gesture != 'Unknown':
+            cv2.putText(
+                image, f'Gesture: {predicted_gesture}', (10, 70),
+                cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0),
+                2, cv2.LINE_AA)
+        # If the gesture is 'Unknown' or no prediction, do not display anything
+
+        # Draw the per-stage p50/p95/p99 HUD (refreshed a few times per second)
+        if key == ord('h'):
+            SHOW_HUD = not SHOW_HUD
+        if SHOW_HUD:
+            if render_start - last_hud_update >= HUD_REFRESH_INTERVAL:
+                last_hud_update = render_start
+                hud_lines = ['stage          p50    p95    p99'] + timers.lines()
+            for idx, line in enumerate(hud_lines):
                 cv2.putText(
-                    image, f'Gesture: {predicted_gesture}', (10, 70),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0),
-                    2, cv2.LINE_AA)
-            # If the gesture is 'Unknown' or no prediction, do not display anything
-
-            # Display the frame in the named window
-            cv2.imshow(window_name, image)
-
-            # Break the loop if 'q' is pressed
-            if key == ord('q'):
-                break
-
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            traceback.print_exc()
+                    image, line, (10, 100 + idx * 18),
+                    cv2.FONT_HERSHEY_PLAIN, 1, (0, 255, 255), 1, cv2.LINE_AA)
+
+        # Display the frame in the named window
+        cv2.imshow(window_name, image)
+        render_stats.record(time.perf_counter() - render_start)
+        timers.record('render', (time.perf_counter() - render_start) * 1000.0)
+
+        # Report per-stage throughput and queue depth
+        if render_start - last_stats_print >= PIPELINE_STATS_INTERVAL:
+            last_stats_print = render_start
+            print(f"Pipeline: {pipeline_summary(capture, stages, {'landmark': landmark_queue, 'render': render_queue})}"
+                  f" | render {render_stats.throughput():.1f}/s")
+
+        # Break the loop if 'q' is pressed
+        if key == ord('q'):
             break
 
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        traceback.print_exc()
+        break
+
+capture.stop()
+for q in (landmark_queue, render_queue):
+    q.close()  # Release a stage blocked on a full queue after an early quit
+for stage in stages:
+    stage.stop()
+if hands is not None:
+    hands.close()
+print(f"Pipeline: {pipeline_summary(capture, stages, {'landmark': landmark_queue, 'render': render_queue})}"
+      f" | render {render_stats.throughput():.1f}/s")
+
 cap.release()
-cv2.destroyAllWindows()
-tool.close()
-engine.stop()  # Stop the TTS engine
+if not args.headless:
+    cv2.destroyAllWindows()
+if grammar is not None:
+    grammar.close()
+    print(f"Grammar: {grammar.summary()}")
+print("Stage latency (p50 / p95 / p99):")
+for line in timers.lines():
+    print(f"  {line}")
+print(f"Inference: {runner.summary()}")
+print(f"Quality: {governor.summary()}")
+print(f"Motion gate: {motion_gate.summary(runner.stats()['mean_ms'])}")
+landmark_stats = stages[0].stats
+print(f"Idle mode: {idle.summary(active_capture_fps, landmark_stats.busy_seconds * 1000.0 / max(landmark_stats.processed, 1))}")
+print(f"Word latency ({RECOGNITION_MODE} mode): {word_latency.summary()}")
+speech.stop()  # Stop the TTS worker
+print(f"Speech: {speech.summary()}")
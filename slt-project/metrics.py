@@ -0,0 +1,116 @@
+# metrics.py
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+ROLLING_WINDOW = 1024           # Most recent samples kept per timer
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+# Rolling latency samples (milliseconds) with lifetime count and sum
+class RollingTimer:
+    def __init__(self, window=ROLLING_WINDOW):
+        self.count = 0
+        self.total_ms = 0.0
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms):
+        with self._lock:
+            self._samples.append(elapsed_ms)
+            self.count += 1
+            self.total_ms += elapsed_ms
+
+    # Function to get rolling quantiles in ms, e.g. {0.5: 1.2, 0.95: 3.4, 0.99: 5.6}
+    def quantiles(self, quantiles=QUANTILES):
+        with self._lock:
+            samples = np.array(self._samples, dtype=np.float64)
+        if not samples.size:
+            return {q: 0.0 for q in quantiles}
+        return dict(zip(quantiles, np.quantile(samples, quantiles)))
+
+
+# Named RollingTimers, created on first use and kept in insertion order
+class StageTimers:
+    def __init__(self, window=ROLLING_WINDOW):
+        self.window = window
+        self.timers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        timer = self.timers.get(name)
+        if timer is None:
+            with self._lock:
+                timer = self.timers.setdefault(name, RollingTimer(self.window))
+        return timer
+
+    def record(self, name, elapsed_ms):
+        self.get(name).record(elapsed_ms)
+
+    # Context manager to time a block: `with timers.time('render'): ...`
+    @contextmanager
+    def time(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000.0)
+
+    def snapshot(self):
+        return {
+            name: {'count': timer.count,
+                   **{f"p{int(q * 100)}_ms": value for q, value in timer.quantiles().items()}}
+            for name, timer in list(self.timers.items())
+        }
+
+    # Function to format one 'stage p50/p95/p99' line per timer, for the HUD or logs
+    def lines(self):
+        return [f"{name:<12} {stats['p50_ms']:6.1f} {stats['p95_ms']:6.1f} {stats['p99_ms']:6.1f} ms"
+                for name, stats in self.snapshot().items()]
+
+
+# === Prometheus text exposition format
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
+
+
+# Function to format a family of RollingTimers as a Prometheus summary in seconds
+# `timers` maps a label value (or None for an unlabelled series) to a RollingTimer
+def prometheus_summary(name, help_text, timers, label=None):
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+    for label_value, timer in timers.items():
+        base = {label: label_value} if label and label_value is not None else {}
+        for q, value in timer.quantiles().items():
+            lines.append(f"{name}{_labels({**base, 'quantile': q})} {value / 1000.0:.6f}")
+        lines.append(f"{name}_sum{_labels(base)} {timer.total_ms / 1000.0:.6f}")
+        lines.append(f"{name}_count{_labels(base)} {timer.count}")
+    return lines
+
+
+# Function to format a batching.Histogram snapshot as a Prometheus histogram
+# `scale` converts bucket bounds and the sum (e.g. 0.001 for milliseconds -> seconds)
+def prometheus_histogram(name, help_text, snapshot, scale=1.0):
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    cumulative = 0
+    for upper, count in snapshot['buckets'].items():
+        cumulative += count
+        le = upper if upper == '+Inf' else f"{float(upper) * scale:g}"
+        lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+    lines.append(f"{name}_sum {snapshot['sum'] * scale:.6f}")
+    lines.append(f"{name}_count {snapshot['count']}")
+    return lines
+
+
+# Function to format one gauge or counter; `values` maps a label dict (as a tuple of
+# items) or None to a number
+def prometheus_value(name, help_text, values, metric_type='gauge'):
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in values.items():
+        lines.append(f"{name}{_labels(dict(labels) if labels else None)} {value}")
+    return lines
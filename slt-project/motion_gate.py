@@ -0,0 +1,90 @@
+# motion_gate.py
+
+import time
+import numpy as np
+
+MOTION_THRESHOLD = 0.003  # Mean absolute landmark change (normalized coordinates) that counts as motion
+IDLE_AFTER_SECONDS = 5.0  # Seconds without hands before entering idle mode
+IDLE_FPS = 4.0            # Capture/detection rate while idle
+
+
+# Function to score how much a landmark window moved relative to a reference window
+# Appearing or disappearing hands change the zero-filled slots, so they score as motion too
+def motion_score(window, reference):
+    return float(np.abs(window - reference).mean())
+
+
+# Skips model calls on windows that barely changed since the last call, since they would
+# produce the same prediction; the caller keeps its previous result
+class MotionGate:
+    def __init__(self, threshold=MOTION_THRESHOLD):
+        self.threshold = threshold
+        self.checked = 0
+        self.skipped = 0
+        self.last_score = 0.0
+        self._reference = None
+
+    # Function to decide whether `window` is worth scoring; remembers it when it is
+    def should_predict(self, window):
+        self.checked += 1
+        if self._reference is None:
+            self._reference = np.array(window, dtype=np.float32)
+            return True
+        self.last_score = motion_score(window, self._reference)
+        if self.last_score < self.threshold:
+            self.skipped += 1
+            return False
+        np.copyto(self._reference, window)
+        return True
+
+    def reset(self):
+        self._reference = None
+
+    # Function to describe skipped calls and the model time they would have cost
+    def summary(self, mean_predict_ms=0.0):
+        saved_ms = self.skipped * mean_predict_ms
+        return (f"skipped {self.skipped} of {self.checked} model calls "
+                f"(~{saved_ms / 1000.0:.1f} s of inference saved)")
+
+
+# Drops the capture/detection rate after `idle_after` seconds without hands and returns to
+# the full rate as soon as a processed frame has hands in it
+class IdleController:
+    def __init__(self, idle_after=IDLE_AFTER_SECONDS, idle_fps=IDLE_FPS):
+        self.idle_after = idle_after
+        self.idle_interval = 1.0 / idle_fps
+        self.is_idle = False
+        self.idle_seconds = 0.0
+        self.wakeups = 0
+        self._last_hands = time.perf_counter()
+        self._idle_since = None
+
+    # Function to record whether the latest frame had hands; returns True if the mode changed
+    def update(self, has_hands):
+        now = time.perf_counter()
+        if has_hands:
+            self._last_hands = now
+            if self.is_idle:
+                self.is_idle = False
+                self.idle_seconds += now - self._idle_since
+                self.wakeups += 1
+                return True
+        elif not self.is_idle and now - self._last_hands >= self.idle_after:
+            self.is_idle = True
+            self._idle_since = now
+            return True
+        return False
+
+    # Function to get the minimum interval between captured frames for the current mode
+    def capture_interval(self):
+        return self.idle_interval if self.is_idle else 0.0
+
+    # Function to estimate the detection time saved while idle, given the active frame rate
+    # and the mean cost of one detected frame
+    def summary(self, active_fps, mean_frame_ms):
+        idle_seconds = self.idle_seconds
+        if self.is_idle:
+            idle_seconds += time.perf_counter() - self._idle_since
+        skipped_frames = max(idle_seconds * (active_fps - 1.0 / self.idle_interval), 0.0)
+        return (f"idle {idle_seconds:.0f} s, {self.wakeups} wakeups, ~{skipped_frames:.0f} frames not "
+                f"captured (~{skipped_frames * mean_frame_ms / 1000.0:.1f} s of detection saved)")
@@ -0,0 +1,126 @@
+# overlay.py
+# Cached overlay compositing for the recorder window. The button bar and the text lines are
+# rendered once into a BGR image plus a uint8 alpha mask, and blended into the frame only
+# inside their own region with integer arithmetic. The button bar is rebuilt only when a
+# button's click effect changes, and a text layer only when its text or position changes.
+
+import numpy as np
+import cv2
+
+ACTIVE_COLOR = (0, 255, 0)  # Click effect tint
+ACTIVE_ALPHA = 0.3          # Transparency factor of the click effect
+
+
+# Function to split an icon into a BGR image and a float alpha in [0, 1]
+def split_icon(icon):
+    if icon.ndim == 2:
+        icon = cv2.cvtColor(icon, cv2.COLOR_GRAY2BGR)
+    if icon.shape[2] == 4:
+        return icon[:, :, :3], icon[:, :, 3].astype(np.float32) / 255.0
+    return icon, np.ones(icon.shape[:2], dtype=np.float32)
+
+
+# A prebuilt BGR image with a uint8 alpha mask, drawn at a fixed position
+class Layer:
+    def __init__(self, image, alpha, pos):
+        self.pos = pos
+        self.height, self.width = alpha.shape
+        alpha = alpha.astype(np.uint16)[:, :, np.newaxis]
+        self._premultiplied = image.astype(np.uint16) * alpha  # Foreground term, computed once
+        self._inverse = 255 - alpha
+
+    # Function to blend the layer into `frame` in place, touching only the covered region
+    def draw(self, frame):
+        x, y = self.pos
+        # Clip the layer to the frame
+        left, top = max(-x, 0), max(-y, 0)
+        right = min(self.width, frame.shape[1] - x)
+        bottom = min(self.height, frame.shape[0] - y)
+        if right <= left or bottom <= top:
+            return
+        roi = frame[y + top:y + bottom, x + left:x + right]
+        blended = self._premultiplied[top:bottom, left:right] + roi * self._inverse[top:bottom, left:right]
+        roi[...] = (blended + 127) // 255
+
+
+# The recorder's button bar; one composited layer per combination of active buttons
+class ButtonBar:
+    def __init__(self, buttons, click_effect_duration=0.2):
+        self.buttons = buttons
+        self.click_effect_duration = click_effect_duration
+        self.x0 = min(button['pos'][0] for button in buttons)
+        self.y0 = min(button['pos'][1] for button in buttons)
+        # One extra pixel: the click effect rectangle includes its far edge, as cv2.rectangle does
+        self.x1 = max(button['pos'][0] + button['size'][0] for button in buttons) + 1
+        self.y1 = max(button['pos'][1] + button['size'][1] for button in buttons) + 1
+        self._layers = {}
+
+    def _build(self, states):
+        image = np.zeros((self.y1 - self.y0, self.x1 - self.x0, 3), dtype=np.float32)
+        alpha = np.zeros(image.shape[:2], dtype=np.float32)
+        for button, is_active in zip(self.buttons, states):
+            icon, icon_alpha = split_icon(button['icon'])
+            icon = icon.astype(np.float32)
+            h, w = icon_alpha.shape
+            x, y = button['pos'][0] - self.x0, button['pos'][1] - self.y0
+            if is_active:
+                image[y:y + h + 1, x:x + w + 1] = ACTIVE_COLOR
+                alpha[y:y + h + 1, x:x + w + 1] = ACTIVE_ALPHA
+                # Same result as blending the tint over the icon already drawn on the frame:
+                # tint * 0.3 + (icon over frame) * 0.7, rewritten as a single layer over the frame
+                tinted_alpha = ACTIVE_ALPHA + (1 - ACTIVE_ALPHA) * icon_alpha
+                icon = ((1 - ACTIVE_ALPHA) * icon_alpha[:, :, np.newaxis] * icon
+                        + ACTIVE_ALPHA * np.array(ACTIVE_COLOR, dtype=np.float32)) / tinted_alpha[:, :, np.newaxis]
+                icon_alpha = tinted_alpha
+            image[y:y + h, x:x + w] = icon
+            alpha[y:y + h, x:x + w] = icon_alpha
+        return Layer(np.clip(image + 0.5, 0, 255).astype(np.uint8),
+                     np.clip(alpha * 255 + 0.5, 0, 255).astype(np.uint8), (self.x0, self.y0))
+
+    # Function to draw the buttons, ending click effects that have run their duration
+    def draw(self, frame, now):
+        for button in self.buttons:
+            if button['is_active'] and (now - button['last_clicked'] > self.click_effect_duration):
+                button['is_active'] = False
+        states = tuple(button['is_active'] for button in self.buttons)
+        layer = self._layers.get(states)
+        if layer is None:
+            layer = self._layers[states] = self._build(states)
+        layer.draw(frame)
+
+
+# A line of anti-aliased text, re-rendered only when the text or its position changes
+class TextLayer:
+    def __init__(self, color, font_scale=1, thickness=2, font=cv2.FONT_HERSHEY_SIMPLEX):
+        self.color = color
+        self.font_scale = font_scale
+        self.thickness = thickness
+        self.font = font
+        self.renders = 0
+        self._key = None
+        self._layer = None
+
+    def _render(self, text, org, center_width):
+        (text_width, text_height), baseline = cv2.getTextSize(text, self.font, self.font_scale, self.thickness)
+        x, y = org
+        if center_width is not None:
+            x = (center_width - text_width) // 2
+        pad = self.thickness
+        mask = np.zeros((text_height + baseline + 2 * pad, text_width + 2 * pad), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, text_height + pad), self.font, self.font_scale,
+                    255, self.thickness, cv2.LINE_AA)
+        image = np.empty(mask.shape + (3,), dtype=np.uint8)
+        image[:] = self.color
+        self.renders += 1
+        return Layer(image, mask, (x - pad, y - text_height - pad))
+
+    # Function to draw `text` with its baseline at `org` (x, y), as cv2.putText would
+    # With `center_width`, x is ignored and the text is centred in that width
+    def draw(self, frame, text, org, center_width=None):
+        if not text:
+            return
+        key = (text, org, center_width)
+        if key != self._key:
+            self._layer = self._render(text, org, center_width)
+            self._key = key
+        self._layer.draw(frame)
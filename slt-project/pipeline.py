@@ -0,0 +1,236 @@
+# pipeline.py
+
+import threading
+import time
+import traceback
+from collections import deque
+
+
+# Bounded queue that drops the oldest item instead of blocking when full, so a slow
+# consumer always works on the freshest data. With block=True put() waits for space
+# instead, for finite sources where every item must be processed
+class DropOldestQueue:
+    def __init__(self, maxsize=2, block=False):
+        self.maxsize = maxsize
+        self.block = block
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, item):
+        with self._cond:
+            if self.block:
+                while len(self._items) >= self.maxsize and not self._closed:
+                    self._cond.wait(0.1)
+            if self._closed:
+                return  # Nothing reads a closed queue
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify_all()
+
+    # Function to take the oldest queued item, or None on timeout / after close()
+    def get(self, timeout=None):
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()  # Wake a blocked put()
+            return item
+
+    # True once the queue is closed and every queued item has been taken
+    @property
+    def finished(self):
+        with self._cond:
+            return self._closed and not self._items
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+# Rolling throughput and busy-time counters for one stage
+class StageStats:
+    def __init__(self, window_seconds=5.0):
+        self.window_seconds = window_seconds
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self._completions = deque()
+        self._lock = threading.Lock()
+
+    def record(self, busy_seconds):
+        now = time.perf_counter()
+        with self._lock:
+            self.processed += 1
+            self.busy_seconds += busy_seconds
+            self._completions.append(now)
+            while self._completions and now - self._completions[0] > self.window_seconds:
+                self._completions.popleft()
+
+    def throughput(self):
+        now = time.perf_counter()
+        with self._lock:
+            recent = [t for t in self._completions if now - t <= self.window_seconds]
+        if len(recent) < 2:
+            return 0.0
+        return (len(recent) - 1) / max(recent[-1] - recent[0], 1e-9)
+
+
+# Camera reader thread that keeps only the newest frame, so the camera's internal buffer
+# never fills with stale frames while the rest of the pipeline is busy. Finite sources
+# (video files, image directories, landmark replays) are read losslessly instead: the
+# reader waits for each frame to be taken, so every frame is processed
+class LatestFrameCapture:
+    def __init__(self, cap, name='capture', timers=None, lossless=None):
+        self.cap = cap
+        self.name = name
+        self.timers = timers  # Optional metrics.StageTimers; records the camera read time
+        self.stats = StageStats()
+        self.frames_skipped = 0
+        # Plain cv2.VideoCapture objects are treated as cameras
+        self.lossless = not getattr(cap, 'live', True) if lossless is None else lossless
+        self.min_interval = 0.0  # Seconds between reads; raised to throttle the camera while idle
+        self.running = False
+        self._wake = threading.Event()
+        self._frame = None
+        self._captured_at = None
+        self._frame_id = 0
+        self._read_id = 0
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self.running = True
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while self.running:
+            start = time.perf_counter()
+            ret, frame = self.cap.read()
+            if not ret:
+                if getattr(self.cap, 'live', True):
+                    print("Failed to capture image.")
+                break
+            read_seconds = time.perf_counter() - start
+            with self._cond:
+                if self.lossless:
+                    # Wait for the previous frame to be taken instead of replacing it
+                    while self._frame_id > self._read_id and self.running:
+                        self._cond.wait(0.1)
+                    if not self.running:
+                        break
+                elif self._frame_id > self._read_id:
+                    self.frames_skipped += 1  # The previous frame was never consumed
+                self._frame = frame
+                self._captured_at = time.perf_counter()
+                self._frame_id += 1
+                self._cond.notify_all()
+            self.stats.record(read_seconds)
+            if self.timers is not None:
+                self.timers.record(self.name, read_seconds * 1000.0)
+            if self.min_interval:
+                self._wake.wait(max(self.min_interval - (time.perf_counter() - start), 0.0))
+                self._wake.clear()
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+
+    # Function to change the read interval; lowering it takes effect immediately
+    def set_interval(self, seconds):
+        self.min_interval = seconds
+        self._wake.set()
+
+    # Function to wait for a frame newer than the last one returned: (frame_id, captured_at, frame)
+    def read(self, timeout=1.0):
+        with self._cond:
+            if self._frame_id == self._read_id and self.running:
+                self._cond.wait(timeout)
+            if self._frame_id == self._read_id:
+                return None
+            self._read_id = self._frame_id
+            self._cond.notify_all()  # Wake a lossless reader waiting for the frame to be taken
+            return self._read_id, self._captured_at, self._frame
+
+    # True once the reader has stopped and its last frame has been taken
+    @property
+    def finished(self):
+        with self._cond:
+            return not self.running and self._frame_id == self._read_id
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+
+
+# Worker thread that applies `fn` to each item from `source` and forwards non-None results
+# `source` is either a DropOldestQueue or a LatestFrameCapture. Once the source is finished
+# and drained the stage closes `output`, so the end of the stream reaches every stage
+class Stage:
+    def __init__(self, name, fn, source, output=None, on_error=None):
+        self.name = name
+        self.fn = fn
+        self.source = source
+        self.output = output
+        self.on_error = on_error
+        self.stats = StageStats()
+        self.running = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self.running = True
+        self._thread.start()
+        return self
+
+    def _next_item(self):
+        if isinstance(self.source, LatestFrameCapture):
+            return self.source.read(timeout=0.1)
+        return self.source.get(timeout=0.1)
+
+    def _run(self):
+        while self.running:
+            item = self._next_item()
+            if item is None:
+                if self.source.finished:
+                    break
+                continue
+            start = time.perf_counter()
+            try:
+                result = self.fn(item)
+            except Exception as e:
+                print(f"An error occurred in the {self.name} stage: {e}")
+                traceback.print_exc()
+                self.running = False
+                if isinstance(self.source, DropOldestQueue):
+                    self.source.close()  # Release an upstream stage blocked on put()
+                if self.on_error:
+                    self.on_error(e)
+                break
+            self.stats.record(time.perf_counter() - start)
+            if result is not None and self.output is not None:
+                self.output.put(result)
+        if self.output is not None:
+            self.output.close()
+
+    def stop(self):
+        self.running = False
+        self._thread.join(timeout=1.0)
+
+
+# Function to describe throughput and queue depth of every stage on one line
+def pipeline_summary(capture, stages, queues):
+    parts = [f"{capture.name} {capture.stats.throughput():.1f}/s (skipped {capture.frames_skipped})"]
+    for stage in stages:
+        parts.append(f"{stage.name} {stage.stats.throughput():.1f}/s")
+    for name, q in queues.items():
+        parts.append(f"{name} q={len(q)}/{q.maxsize} dropped={q.dropped}")
+    return ' | '.join(parts)
@@ -0,0 +1,87 @@
+# prediction_smoothing.py
+
+import time
+from collections import deque
+import numpy as np
+
+SMOOTHING_METHODS = ('none', 'ema', 'mean', 'vote')
+
+
+# Aggregates class probabilities over recent overlapping windows before thresholding
+#   'ema'  - exponential moving average with weight `alpha` on the newest window
+#   'mean' - plain average of the last `window` predictions
+#   'vote' - share of the last `window` predictions won by each class
+#   'none' - newest probabilities unchanged
+class ProbabilitySmoother:
+    def __init__(self, method='ema', alpha=0.5, window=3):
+        if method not in SMOOTHING_METHODS:
+            raise ValueError(f"Unknown smoothing method '{method}'. Expected one of {SMOOTHING_METHODS}")
+        self.method = method
+        self.alpha = alpha
+        self._ema = None
+        self._history = deque(maxlen=window)
+
+    def reset(self):
+        self._ema = None
+        self._history.clear()
+
+    # Function to add the newest window's probabilities and return the smoothed ones
+    def update(self, probabilities):
+        probabilities = np.asarray(probabilities, dtype=np.float32)
+        if self.method == 'ema':
+            if self._ema is None:
+                self._ema = probabilities.copy()
+            else:
+                self._ema = self.alpha * probabilities + (1.0 - self.alpha) * self._ema
+            return self._ema
+        if self.method == 'mean':
+            self._history.append(probabilities)
+            return np.mean(self._history, axis=0)
+        if self.method == 'vote':
+            self._history.append(int(np.argmax(probabilities)))
+            votes = np.bincount(list(self._history), minlength=len(probabilities))
+            return votes.astype(np.float32) / self._history.maxlen
+        return probabilities
+
+
+# Measures how long it takes to recognise a word once hands appear, and between words
+class WordLatencyTracker:
+    def __init__(self):
+        self.first_word_ms = []   # Hand onset -> first accepted word
+        self.first_word_frames = []
+        self.next_word_ms = []    # Accepted word -> next accepted word while hands stay in view
+        self._onset = None
+        self._onset_frames = 0
+        self._last_word = None
+
+    # Function to call for every frame with hands in view
+    def hand_frame(self):
+        if self._onset is None:
+            self._onset = time.perf_counter()
+            self._onset_frames = 0
+        self._onset_frames += 1
+
+    # Function to call when no hands are detected; the next hand frame starts a new onset
+    def no_hands(self):
+        self._onset = None
+        self._last_word = None
+
+    # Function to call when a word is added to the sentence
+    def word_accepted(self):
+        now = time.perf_counter()
+        if self._last_word is not None:
+            self.next_word_ms.append((now - self._last_word) * 1000.0)
+        elif self._onset is not None:
+            self.first_word_ms.append((now - self._onset) * 1000.0)
+            self.first_word_frames.append(self._onset_frames)
+        self._last_word = now
+
+    def summary(self):
+        def describe(values, unit):
+            if not values:
+                return 'n/a'
+            return f"median {np.median(values):.0f} {unit}, mean {np.mean(values):.0f} {unit} over {len(values)}"
+
+        return (f"first word: {describe(self.first_word_ms, 'ms')} "
+                f"({describe(self.first_word_frames, 'frames')}); "
+                f"word to word: {describe(self.next_word_ms, 'ms')}")
@@ -0,0 +1,92 @@
+# quality_governor.py
+
+import time
+import cv2
+
+# Quality levels from best to cheapest
+#   detection_width  - frames wider than this are downscaled before hands.process (None = native)
+#   model_complexity - MediaPipe Hands model_complexity (1 = full, 0 = lite)
+#   stride_scale     - multiplier on the prediction stride (higher = fewer model calls)
+QUALITY_LEVELS = [
+    {'name': 'full', 'detection_width': None, 'model_complexity': 1, 'stride_scale': 1},
+    {'name': 'reduced', 'detection_width': 640, 'model_complexity': 1, 'stride_scale': 1},
+    {'name': 'low', 'detection_width': 480, 'model_complexity': 0, 'stride_scale': 2},
+    {'name': 'minimum', 'detection_width': 320, 'model_complexity': 0, 'stride_scale': 3}
+]
+
+TARGET_FPS = 20
+LATENCY_ALPHA = 0.1     # EMA weight of the newest frame latency
+STEP_DOWN_RATIO = 1.0   # Step down when the EMA exceeds the budget
+STEP_UP_RATIO = 0.6     # Step up only when the EMA is well under the budget
+HOLD_FRAMES = 30        # Frames to wait after a change before deciding again
+
+
+# Function to downscale a frame for landmark detection, keeping its aspect ratio
+# Landmarks are normalized, so results map straight back onto the full-size frame
+def detection_input(frame, detection_width):
+    height, width = frame.shape[:2]
+    if detection_width is None or width <= detection_width:
+        return frame
+    scale = detection_width / width
+    return cv2.resize(frame, (detection_width, int(round(height * scale))), interpolation=cv2.INTER_AREA)
+
+
+# Steps quality down when the smoothed per-frame latency exceeds the frame budget and
+# back up once there is headroom; the gap between the two thresholds and the hold period
+# keep it from oscillating between neighbouring levels
+class QualityGovernor:
+    def __init__(self, target_fps=TARGET_FPS, levels=QUALITY_LEVELS, alpha=LATENCY_ALPHA,
+                 step_down_ratio=STEP_DOWN_RATIO, step_up_ratio=STEP_UP_RATIO, hold_frames=HOLD_FRAMES,
+                 enabled=True):
+        self.budget_ms = 1000.0 / target_fps
+        self.levels = levels
+        self.alpha = alpha
+        self.step_down_ratio = step_down_ratio
+        self.step_up_ratio = step_up_ratio
+        self.hold_frames = hold_frames
+        self.enabled = enabled
+        self.index = 0
+        self.latency_ema = None
+        self.changes = 0
+        self._frames_since_change = 0
+        self._level_seconds = [0.0] * len(levels)
+        self._level_since = time.perf_counter()
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    # Function to record one frame's latency; returns True if the quality level changed
+    def observe(self, frame_ms):
+        if self.latency_ema is None:
+            self.latency_ema = frame_ms
+        else:
+            self.latency_ema = self.alpha * frame_ms + (1.0 - self.alpha) * self.latency_ema
+        self._frames_since_change += 1
+
+        if not self.enabled or self._frames_since_change < self.hold_frames:
+            return False
+        if self.latency_ema > self.budget_ms * self.step_down_ratio and self.index < len(self.levels) - 1:
+            self._set_level(self.index + 1)
+            return True
+        if self.latency_ema < self.budget_ms * self.step_up_ratio and self.index > 0:
+            self._set_level(self.index - 1)
+            return True
+        return False
+
+    def _set_level(self, index):
+        now = time.perf_counter()
+        self._level_seconds[self.index] += now - self._level_since
+        self._level_since = now
+        print(f"Quality: {self.level['name']} -> {self.levels[index]['name']} "
+              f"(frame latency {self.latency_ema:.1f} ms, budget {self.budget_ms:.1f} ms)")
+        self.index = index
+        self.changes += 1
+        self._frames_since_change = 0
+
+    def summary(self):
+        seconds = list(self._level_seconds)
+        seconds[self.index] += time.perf_counter() - self._level_since
+        total = sum(seconds) or 1.0
+        shares = ', '.join(f"{level['name']} {s / total:.0%}" for level, s in zip(self.levels, seconds))
+        return f"{self.changes} level changes; time at each level: {shares}"
@@ -0,0 +1,54 @@
+# ring_buffer.py
+
+import numpy as np
+
+
+# Fixed-size rolling window of landmark frames (oldest frame first)
+# Every frame is written twice, at slot i and slot i + sequence_length, so the last
+# sequence_length frames are always one contiguous slice of the storage and can be
+# handed to the model as a view instead of being rebuilt from a list each frame
+class LandmarkRingBuffer:
+    def __init__(self, sequence_length=15, num_landmarks=21 * 3 * 2):
+        self.sequence_length = sequence_length
+        self.num_landmarks = num_landmarks
+        self._frames = np.zeros((2 * sequence_length, num_landmarks), dtype=np.float32)
+        self._head = 0   # Slot the next frame is written to
+        self._count = 0  # Number of valid frames (capped at sequence_length)
+
+    def __len__(self):
+        return self._count
+
+    def is_full(self):
+        return self._count == self.sequence_length
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    # Function to add one (num_landmarks,) frame, overwriting the oldest once full
+    def append(self, frame):
+        self._frames[self._head] = frame
+        self._frames[self._head + self.sequence_length] = self._frames[self._head]
+        self._head = (self._head + 1) % self.sequence_length
+        self._count = min(self._count + 1, self.sequence_length)
+
+    # Function to return a zero-copy (count, num_landmarks) view of the valid frames in time order
+    # The view is overwritten by later appends; use ordered() to keep a snapshot
+    def view(self):
+        if self._count < self.sequence_length:
+            return self._frames[:self._count]
+        return self._frames[self._head:self._head + self.sequence_length]
+
+    # Function to return a zero-copy (1, sequence_length, num_landmarks) model input
+    def window(self):
+        return self.view()[np.newaxis]
+
+    # Function to return a copy of the valid frames in time order
+    def ordered(self):
+        return self.view().copy()
+
+    # Function to return the most recent frame (None if empty)
+    def latest(self):
+        if self._count == 0:
+            return None
+        return self._frames[(self._head - 1) % self.sequence_length]
@@ -0,0 +1,166 @@
+# speech.py
+
+import os
+import threading
+import time
+import traceback
+from collections import deque
+import numpy as np
+import pyttsx3
+from scipy.io import wavfile
+
+try:
+    import sounddevice as sd  # Plays pre-rendered gesture audio
+except (ImportError, OSError):
+    sd = None
+
+SPEECH_CACHE_PATH = 'speech_cache'
+RATE_INCREASE = 50          # Words per minute added to the engine's default rate
+MAX_UTTERANCE_AGE = 2.0     # Seconds; older queued words are no longer worth saying
+MERGE_WINDOW = 0.5          # Seconds; queued words closer together than this are spoken as one phrase
+
+
+# One long-lived thread that owns the pyttsx3 engine and speaks queued utterances in order
+# Words for labels in `vocabulary` are pre-rendered to WAV files once and played directly
+class SpeechWorker:
+    def __init__(self, vocabulary=(), cache_path=SPEECH_CACHE_PATH, rate_increase=RATE_INCREASE,
+                 max_age=MAX_UTTERANCE_AGE, merge_window=MERGE_WINDOW, enabled=True):
+        self.cache_path = cache_path
+        self.rate_increase = rate_increase
+        self.max_age = max_age
+        self.merge_window = merge_window
+        self.dropped = 0
+        self.merged = 0
+        self.latency_ms = {'cached': [], 'engine': []}  # Queue -> audio start
+        self._audio = {}                                # Label -> (samplerate, samples)
+        self._to_render = [str(label) for label in vocabulary]
+        self._pending = deque()                         # [words, queued_at, is_word]
+        self._cond = threading.Condition()
+        self._engine = None
+        self._started_at = None
+        self.running = enabled  # When disabled, say_* calls are dropped and no engine is started
+        self._thread = threading.Thread(target=self._run, name='speech', daemon=True)
+        if enabled:
+            self._thread.start()
+
+    # Function to queue a recognised word; words still waiting are merged with it,
+    # and words that waited longer than max_age are dropped
+    def say_word(self, text):
+        if not self.running:
+            return
+        now = time.perf_counter()
+        with self._cond:
+            self._drop_stale(now)
+            if self._pending and self._pending[-1][2] and now - self._pending[-1][1] <= self.merge_window:
+                self._pending[-1][0].append(text)
+                self.merged += 1
+            else:
+                self._pending.append([[text], now, True])
+            self._cond.notify()
+
+    # Function to queue a sentence; it supersedes every word still waiting
+    def say_sentence(self, text):
+        if not self.running:
+            return
+        with self._cond:
+            self.dropped += len(self._pending)
+            self._pending.clear()
+            self._pending.append([[text], time.perf_counter(), False])
+            self._cond.notify()
+
+    def _drop_stale(self, now):
+        while self._pending and now - self._pending[0][1] > self.max_age:
+            self._pending.popleft()
+            self.dropped += 1
+
+    def _init_engine(self):
+        engine = pyttsx3.init()
+        rate = engine.getProperty('rate')
+        engine.setProperty('rate', rate + self.rate_increase)
+        engine.connect('started-utterance', self._on_engine_start)
+        return engine
+
+    def _on_engine_start(self, name):
+        if self._started_at is not None:
+            self.latency_ms['engine'].append((time.perf_counter() - self._started_at) * 1000.0)
+            self._started_at = None
+
+    def _cache_file(self, label):
+        safe = ''.join(c if c.isalnum() or c in '-_' else '_' for c in label)
+        return os.path.join(self.cache_path, f"rate{self.rate_increase:+d}", f"{safe}.wav")
+
+    # Function to render one label to a WAV file (if not cached on disk yet) and load it
+    def _prerender(self, label):
+        path = self._cache_file(label)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._engine.save_to_file(label, path)
+            self._engine.runAndWait()
+        try:
+            samplerate, samples = wavfile.read(path)
+        except Exception as e:
+            print(f"Could not pre-render speech for '{label}': {e}")
+            return
+        if samples.size:
+            self._audio[label] = (samplerate, samples)
+
+    # Function to speak queued words, as back-to-back pre-rendered clips when all are cached
+    def _speak(self, words, queued_at):
+        clips = [self._audio.get(word) for word in words] if sd is not None else [None]
+        if all(clips) and len({samplerate for samplerate, _ in clips}) == 1:
+            samples = np.concatenate([samples for _, samples in clips])
+            self.latency_ms['cached'].append((time.perf_counter() - queued_at) * 1000.0)
+            sd.play(samples, clips[0][0])
+            sd.wait()
+        else:
+            self._started_at = queued_at
+            self._engine.say(' '.join(words))
+            self._engine.runAndWait()
+
+    def _run(self):
+        try:
+            self._engine = self._init_engine()
+        except Exception as e:
+            print(f"An error occurred while initializing text-to-speech: {e}")
+            traceback.print_exc()
+            self.running = False
+            return
+
+        while self.running:
+            with self._cond:
+                self._drop_stale(time.perf_counter())
+                if not self._pending and not self._to_render:
+                    self._cond.wait(0.5)
+                    continue
+                item = self._pending.popleft() if self._pending else None
+                label = self._to_render.pop(0) if item is None else None
+
+            try:
+                if item is not None:
+                    self._speak(item[0], item[1])
+                else:
+                    # Pre-render vocabulary only while nothing is waiting to be spoken
+                    self._prerender(label)
+            except Exception as e:
+                print(f"An error occurred during speech: {e}")
+                traceback.print_exc()
+
+    def summary(self):
+        parts = []
+        for source, values in self.latency_ms.items():
+            if values:
+                parts.append(f"{source} median {np.median(values):.0f} ms / p95 "
+                             f"{np.percentile(values, 95):.0f} ms over {len(values)}")
+            else:
+                parts.append(f"{source} n/a")
+        return (f"queue -> audio start: {'; '.join(parts)}; "
+                f"{len(self._audio)} pre-rendered, {self.merged} merged, {self.dropped} dropped")
+
+    def stop(self):
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        if self._engine is not None:
+            self._engine.stop()
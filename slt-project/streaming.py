@@ -0,0 +1,103 @@
+# streaming.py
+
+import threading
+import time
+import numpy as np
+from ring_buffer import LandmarkRingBuffer
+
+
+# Per-client streaming state: a bounded ring buffer of the most recent frames
+class StreamSession:
+    def __init__(self, session_id, sequence_length, num_landmarks, stride):
+        self.session_id = session_id
+        self.buffer = LandmarkRingBuffer(sequence_length, num_landmarks)
+        self.stride = stride
+        self.frames_since_prediction = 0
+        self.frames_received = 0
+        self.created = time.monotonic()
+        self.last_active = self.created
+
+    # Function to add a frame and return a window to score once enough new frames have arrived
+    def push(self, frame):
+        self.buffer.append(frame)
+        self.frames_received += 1
+        self.frames_since_prediction += 1
+        self.last_active = time.monotonic()
+
+        if self.buffer.is_full() and self.frames_since_prediction >= self.stride:
+            self.frames_since_prediction = 0
+            # Snapshot the window, since it may wait in the batcher while new frames arrive
+            return self.buffer.ordered()
+        return None
+
+    def reset(self):
+        self.buffer.clear()
+        self.frames_since_prediction = 0
+
+
+# Keeps the set of live streaming sessions bounded in count and idle time
+class SessionManager:
+    def __init__(self, sequence_length=15, num_landmarks=21 * 3 * 2, stride=None,
+                 max_sessions=256, idle_timeout=60.0):
+        self.sequence_length = sequence_length
+        self.num_landmarks = num_landmarks
+        self.stride = stride or sequence_length  # Default: non-overlapping windows
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.evicted = 0
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    # Function to open a session, returning None if the server is at capacity
+    def open(self, session_id):
+        with self._lock:
+            if session_id not in self._sessions and len(self._sessions) >= self.max_sessions:
+                return None
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = StreamSession(session_id, self.sequence_length, self.num_landmarks, self.stride)
+                self._sessions[session_id] = session
+            return session
+
+    def get(self, session_id):
+        return self._sessions.get(session_id)
+
+    def close(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    # Function to drop sessions that have not sent a frame within idle_timeout seconds
+    def evict_idle(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [sid for sid, session in self._sessions.items() if session.last_active < cutoff]
+            for session_id in idle:
+                del self._sessions[session_id]
+            self.evicted += len(idle)
+        return idle
+
+    # Function to validate one incoming frame (JSON list or raw float32 bytes)
+    def parse_frame(self, data):
+        if isinstance(data, dict):
+            data = data.get('landmarks', None)
+        if data is None:
+            raise ValueError('No landmark data provided.')
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            frame = np.frombuffer(data, dtype='<f4')
+        else:
+            frame = np.asarray(data, dtype=np.float32)
+        if frame.shape != (self.num_landmarks,):
+            raise ValueError(f'Invalid frame shape. Expected ({self.num_landmarks},) but got {frame.shape}')
+        return frame
+
+    def stats(self):
+        return {
+            'active_sessions': len(self._sessions),
+            'max_sessions': self.max_sessions,
+            'idle_timeout_s': self.idle_timeout,
+            'evicted': self.evicted,
+            'bytes_per_session': self.sequence_length * self.num_landmarks * 4
+        }
@@ -0,0 +1,76 @@
+# training_pipeline.py
+# tf.data input pipeline for Model.py. Instead of fitting on whole in-memory arrays, only the
+# row indices and labels are shuffled (with a bounded buffer) and batched; each batch of
+# sequences is then gathered from the memory-mapped packed shard in parallel map calls, and
+# batches are prefetched while the model trains on the previous one.
+
+import time
+import numpy as np
+import tensorflow as tf
+
+INPUT_PIPELINES = ('numpy', 'tfdata')
+BATCH_SIZE = 16
+SHUFFLE_BUFFER = 1024  # Indices held in the shuffle buffer; the full dataset when smaller
+
+
+# Function to build a dataset of (batch, sequence_length, num_landmarks) batches and labels
+# from rows `indices` of X (a NumPy array or np.memmap) with labels `y` for those rows.
+# `cache` keeps loaded batches in memory after the first epoch (for unshuffled data such as
+# the validation split); `preprocess(x, y)` runs batched after loading, every epoch
+def make_dataset(X, indices, y, batch_size=BATCH_SIZE, shuffle=False, shuffle_buffer=SHUFFLE_BUFFER,
+                 cache=False, preprocess=None, seed=None):
+    _, sequence_length, num_landmarks = X.shape
+
+    def gather(batch_indices, batch_labels):
+        # Read the rows in shard order; labels are reordered to match
+        order = np.argsort(batch_indices)
+        return np.asarray(X[batch_indices[order]], dtype=np.float32), batch_labels[order]
+
+    def load(batch_indices, batch_labels):
+        x, labels = tf.numpy_function(gather, [batch_indices, batch_labels], [tf.float32, tf.int64])
+        x.set_shape([None, sequence_length, num_landmarks])
+        labels.set_shape([None])
+        return x, labels
+
+    dataset = tf.data.Dataset.from_tensor_slices(
+        (np.asarray(indices, dtype=np.int64), np.asarray(y, dtype=np.int64)))
+    if shuffle:
+        dataset = dataset.shuffle(max(min(shuffle_buffer, len(indices)), 1), seed=seed,
+                                  reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size)
+    dataset = dataset.map(load, num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle)
+    if cache:
+        dataset = dataset.cache()
+    if preprocess is not None:
+        dataset = dataset.map(preprocess, num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+# Reports wall time and training samples/sec for every epoch (validation time included)
+class ThroughputCallback(tf.keras.callbacks.Callback):
+    def __init__(self, num_samples):
+        super().__init__()
+        self.num_samples = num_samples
+        self.epoch_seconds = []
+        self._start = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        seconds = time.perf_counter() - self._start
+        self.epoch_seconds.append(seconds)
+        print(f"Epoch {epoch + 1}: {seconds:.2f}s, {self.num_samples / seconds:.0f} samples/s")
+        if logs is not None:
+            logs['epoch_seconds'] = seconds
+            logs['samples_per_sec'] = self.num_samples / seconds
+
+    # Function to summarize throughput; the first epoch includes graph tracing, so it is
+    # reported separately when there are later epochs
+    def summary(self):
+        if not self.epoch_seconds:
+            return 'no epochs'
+        steady = self.epoch_seconds[1:] or self.epoch_seconds
+        mean_seconds = sum(steady) / len(steady)
+        return (f"{len(self.epoch_seconds)} epochs, first {self.epoch_seconds[0]:.2f}s, "
+                f"then mean {mean_seconds:.2f}s ({self.num_samples / mean_seconds:.0f} samples/s)")
@@ -2,21 +2,30 @@ import cv2
 import numpy as np
 import os
 import mediapipe as mp
-import tensorflow as tf
 import sys
-import language_tool_python
 import traceback
-import pyttsx3
-import threading
-import tkinter as tk
-import win32gui
-import win32con
 import time
+import argparse
 import datetime
-from moviepy.editor import ImageSequenceClip, AudioFileClip
-import sounddevice as sd
-from scipy.io.wavfile import write
-import queue
+import threading
+from inference import load_runner
+from ring_buffer import LandmarkRingBuffer
+from landmark_extraction import extract_landmarks
+from pipeline import LatestFrameCapture
+from speech import SpeechWorker, SPEECH_CACHE_PATH
+from quality_governor import QualityGovernor, detection_input, TARGET_FPS
+from frame_sources import open_source, add_source_arguments
+import window_utils
+from overlay import ButtonBar, TextLayer
+from video_writer import StreamingVideoWriter, mux_audio, RECORD_FPS
+from audio_writer import AudioWriter
+
+# Command line options; with no arguments this is the usual camera + window recorder
+# Headless runs recognition only, since recording is driven by the on-screen buttons
+parser = add_source_arguments(argparse.ArgumentParser(description='Sign language recognizer with video recording.'))
+parser.add_argument('--mute', action='store_true', help='Disable text-to-speech (implied by --headless)')
+args = parser.parse_args()
+window_utils.set_headless(args.headless)
 
 # Configure standard output to use UTF-8 encoding
 sys.stdout.reconfigure(encoding='utf-8')
@@ -24,37 +33,26 @@ sys.stdout.reconfigure(encoding='utf-8')
 # Suppress TensorFlow logging
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 
-# Initialize text-to-speech engine
-engine = pyttsx3.init()
-rate = engine.getProperty('rate')
-engine.setProperty('rate', rate + 50)
-
 # Initialize variables for recording
+# Frames go straight to a background encoder; only their timestamps are kept here
 recorded_frames = []
-audio_data = []
-audio_queue = queue.Queue()
+video_writer = None
+audio_writer = None  # Written to disk by its own thread, straight from the audio callback
+save_state = {'thread': None, 'progress': 0.0}  # Save runs on its own thread
 samplerate = 44100  # Sample rate in Hz
 channels = 2        # Number of audio channels
 
-# Function to handle speech
-def speak_text(text):
-    def run_speech():
-        engine.say(text)
-        engine.runAndWait()
-    t = threading.Thread(target=run_speech)
-    t.start()
-
 # Get the directory where the script is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
 # Construct the absolute path to the model file
-model_path = os.path.join(script_dir, 'gesture_recognition_model.keras')
+# Set SLT_MODEL to a .tflite or .onnx export to run without the Keras backend
+model_path = os.environ.get('SLT_MODEL', os.path.join(script_dir, 'gesture_recognition_model.keras'))
 
-# Load the trained model
+# Load the trained model behind a compiled, warmed-up inference runner
 try:
-    model = tf.keras.models.load_model(model_path, compile=False)
-    print(f"Model loaded successfully.")
-    print(f"Model input shape: {model.input_shape}")
+    runner = load_runner(model_path)
+    print(f"Model loaded successfully ({runner.backend} backend).")
 except Exception as e:
     print(f"An error occurred while loading the model: {e}")
     traceback.print_exc()
@@ -75,6 +73,10 @@ gestures = np.array([
 ])
 print(f"Gestures: {gestures}")
 
+# Start the text-to-speech worker; it pre-renders every gesture label so words play instantly
+speech = SpeechWorker(gestures, cache_path=os.path.join(script_dir, SPEECH_CACHE_PATH),
+                      enabled=not (args.mute or args.headless))
+
 # Number of frames in each sequence
 sequence_length = 15
 
@@ -85,54 +87,33 @@ num_landmarks = num_landmarks_per_hand * 2  # For both hands
 # Initialize MediaPipe Hands
 mp_hands = mp.solutions.hands
 
-# Initialize the grammar correction tool
-tool = language_tool_python.LanguageToolPublicAPI('en-UK')
+# Adaptive quality for landmark detection; the display and recording stay at window size
+governor = QualityGovernor(
+    target_fps=float(os.environ.get('SLT_TARGET_FPS', TARGET_FPS)),
+    enabled=os.environ.get('SLT_ADAPTIVE_QUALITY', '1') != '0')
+hands = None             # Rebuilt when the quality level changes model_complexity
+hands_complexity = None
 
-# Access the camera
-cap = cv2.VideoCapture(0)
+# Open the frame source (camera by default)
+try:
+    cap = open_source(args.source, fps=args.source_fps, max_frames=args.max_frames, loop=args.loop)
+except Exception as e:
+    print(f"Cannot open frame source '{args.source}': {e}")
+    exit()
 if not cap.isOpened():
     print("Cannot access camera.")
     exit()
 
 # Create and configure the OpenCV window
 window_name = 'Hand Gesture Recognition'
-cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-
-# Get screen size using tkinter
-root = tk.Tk()
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
-root.destroy()
-
-# Set window size
 window_width = 800
 window_height = 600
-cv2.resizeWindow(window_name, window_width, window_height)
-
-# Calculate top-left corner to center the window
-x = (screen_width // 2) - (window_width // 2)
-y = (screen_height // 2) - (window_height // 2)
-
-# Move window to center
-cv2.moveWindow(window_name, x, y)
-
-# Function to bring window to front
-def bring_window_to_front(window_title):
-    try:
-        hwnd = win32gui.FindWindow(None, window_title)
-        if hwnd:
-            win32gui.ShowWindow(hwnd, win32con.SW_SHOW)
-            win32gui.SetForegroundWindow(hwnd)
-            win32gui.BringWindowToTop(hwnd)
-    except Exception as e:
-        print(f"Failed to bring window to front: {e}")
-
-# Allow some time for the window to initialize
-time.sleep(0.5)
-bring_window_to_front(window_name)
+if not args.headless:
+    window_utils.create_window(window_name, window_width, window_height)
 
 # Initialize variables for gesture recognition
-sequence = []
+sequence = LandmarkRingBuffer(sequence_length, num_landmarks)  # Last 'sequence_length' frames
+frame_landmarks = np.zeros(num_landmarks, dtype=np.float32)  # Reused for every frame
 predicted_gesture = ''
 last_prediction = ''
 sentence = []
@@ -183,48 +164,16 @@ for idx, button in enumerate(buttons):
 # Duration for click effect in seconds
 click_effect_duration = 0.2
 
-def overlay_icon(frame, icon, pos, is_active=False):
-    x, y = pos
-    icon_h, icon_w = icon.shape[:2]
-
-    # Ensure the icon fits within the frame
-    if y + icon_h > frame.shape[0] or x + icon_w > frame.shape[1]:
-        print(f"Warning: Icon at position {pos} exceeds frame dimensions.")
-        return
-
-    # If the icon has an alpha channel, use it as mask
-    if icon.shape[2] == 4:
-        alpha_s = icon[:, :, 3] / 255.0
-        alpha_l = 1.0 - alpha_s
+# Button bar and text lines are prebuilt layers, blended only where they cover the frame
+button_bar = ButtonBar(buttons, click_effect_duration)
+sentence_layer = TextLayer((255, 255, 255))
+gesture_layer = TextLayer((0, 255, 0))
+saving_layer = TextLayer((0, 255, 255), font_scale=0.8)
 
-        for c in range(0, 3):
-            frame[y:y+icon_h, x:x+icon_w, c] = (alpha_s * icon[:, :, c] +
-                                                alpha_l * frame[y:y+icon_h, x:x+icon_w, c])
-    else:
-        frame[y:y+icon_h, x:x+icon_w] = icon
-
-    # If the button is active, overlay a semi-transparent layer for effect
-    if is_active:
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (x, y), (x + icon_w, y + icon_h), (0, 255, 0), -1)
-        alpha = 0.3  # Transparency factor
-        cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
-
-def draw_buttons(frame):
-    current_time = time.time()
-    for button in buttons:
-        # Check if the click effect duration has passed
-        if button['is_active'] and (current_time - button['last_clicked'] > click_effect_duration):
-            button['is_active'] = False
-
-        # Draw the button with effect if active
-        overlay_icon(frame, button['icon'], button['pos'], is_active=button['is_active'])
-
-def audio_callback(indata, frames, time_info, status):
-    audio_queue.put(indata.copy())
-
-def start_audio_recording():
-    global audio_stream
+def start_audio_recording(timestamp):
+    global audio_stream, audio_writer
+    audio_writer = AudioWriter(f'audio_{timestamp}.wav', samplerate, channels)
+    import sounddevice as sd  # Only needed once recording starts
     # Replace 'Stereo Mix' with your system's audio device name or index
     device_info = sd.query_devices()
     device_index = None
@@ -239,7 +188,7 @@ def start_audio_recording():
     audio_stream = sd.InputStream(
         samplerate=samplerate,
         channels=channels,
-        callback=audio_callback,
+        callback=audio_writer.callback,
         dtype='float32',
         device=device_index
     )
@@ -249,49 +198,63 @@ def stop_audio_recording():
     audio_stream.stop()
     audio_stream.close()
 
-def save_video_with_audio():
+# Function to start streaming frames to a new encoder
+def start_video_recording(timestamp):
+    global video_writer
+    video_writer = StreamingVideoWriter(f'video_{timestamp}.mp4', (window_width, window_height), fps=RECORD_FPS)
+
+def update_save_progress(fraction):
+    save_state['progress'] = fraction
+
+def save_video_with_audio(writer, audio, first_frame_time):
     # Generate a unique filename with timestamp
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     video_filename = f'output_{timestamp}.mp4'
-    audio_filename = f'audio_{timestamp}.wav'
 
-    # Save the audio data to a WAV file
-    if audio_data:
-        audio_np = np.concatenate(audio_data, axis=0)
-        write(audio_filename, samplerate, audio_np)
-    else:
-        print("No audio data recorded.")
+    # Flush the frames still queued for the encoder; the rest were encoded while recording
+    temp_video = writer.finish(progress=update_save_progress)
+    print(f"Video encoder: {writer.summary()}")
+    if temp_video is None:
+        print("Video encoding failed; nothing saved.")
+        audio.abort()
         return
 
-    # Extract frames
-    frames = [f['frame'] for f in recorded_frames]
-
-    # Create a video clip from the frames
-    fps = 20  # Adjust this to your desired frame rate
-    video_clip = ImageSequenceClip(frames, fps=fps)
-
-    # Load the audio file using moviepy
-    audio_clip = AudioFileClip(audio_filename)
-
-    # Set the audio to the video clip
-    video_clip = video_clip.set_audio(audio_clip)
-
-    # Write the final video file
-    video_clip.write_videofile(video_filename, codec='libx264', audio_codec='aac')
-
-    print(f"Video saved as '{video_filename}'")
-
-    # Clean up temporary audio file
-    audio_clip.close()
-    os.remove(audio_filename)
+    # The audio is already on disk; this only flushes its last blocks
+    audio_filename = audio.finish()
+    print(f"Audio writer: {audio.summary()}")
+    if audio_filename is None:
+        print("No audio data recorded.")
+        os.replace(temp_video, video_filename)
+        print(f"Video saved without audio as '{video_filename}'")
+        return
 
-    # Reset recorded frames and audio data
+    # Add the audio track, copying the encoded video stream as-is and lining the first
+    # audio sample up with the first recorded frame
+    audio_offset = audio.start_time - first_frame_time if audio.start_time is not None else 0.0
+    if mux_audio(temp_video, audio_filename, video_filename, writer.ffmpeg, audio_offset):
+        os.remove(temp_video)
+        os.remove(audio_filename)
+        print(f"Video saved as '{video_filename}'")
+    else:
+        print(f"Video kept as '{temp_video}' and audio as '{audio_filename}'")
+
+# Function to save the finished recording on a background thread so the window stays live
+def start_save():
+    global video_writer, audio_writer
+    writer, audio, first_frame_time = video_writer, audio_writer, recorded_frames[0]['timestamp']
+    video_writer = None
+    audio_writer = None
     recorded_frames.clear()
-    audio_data.clear()
-    audio_queue.queue.clear()
+    save_state['progress'] = 0.0
+    save_state['thread'] = threading.Thread(
+        target=save_video_with_audio, args=(writer, audio, first_frame_time), name='save', daemon=True)
+    save_state['thread'].start()
+
+def is_saving():
+    return save_state['thread'] is not None and save_state['thread'].is_alive()
 
 def button_clicked(event, x, y, flags, param):
-    global is_recording, is_paused, recorded_frames, audio_data
+    global is_recording, is_paused, recorded_frames
     if event == cv2.EVENT_LBUTTONDOWN:
         for button in buttons:
             bx, by = button['pos']
@@ -304,19 +267,30 @@ def button_clicked(event, x, y, flags, param):
 
                 if label == 'Play':
                     if not is_recording:
+                        if is_saving():
+                            print("Still saving the previous recording.")
+                            break
+                        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                        try:
+                            start_video_recording(timestamp)
+                        except Exception as e:
+                            print(f"Cannot start recording: {e}")
+                            break
                         is_recording = True
                         is_paused = False
                         recorded_frames = []
-                        audio_data = []
-                        audio_queue.queue.clear()
-                        start_audio_recording()
-                        print("Recording started.")
+                        start_audio_recording(timestamp)
+                        print(f"Recording started ({video_writer.backend} encoder).")
                     elif is_paused:
                         is_paused = False
+                        video_writer.resume()
+                        audio_writer.resume()
                         print("Recording resumed.")
                 elif label == 'Pause':
                     if is_recording and not is_paused:
                         is_paused = True
+                        video_writer.pause()
+                        audio_writer.pause()
                         print("Recording paused.")
                 elif label == 'Save':
                     if recorded_frames:
@@ -324,156 +298,173 @@ def button_clicked(event, x, y, flags, param):
                         is_paused = False
                         stop_audio_recording()
                         # Proceed to save the video and audio
-                        save_video_with_audio()
+                        start_save()
                     else:
                         print("No video to save.")
                 break
 
 # Set mouse callback for the window
-cv2.setMouseCallback(window_name, button_clicked)
-
-with mp_hands.Hands(
-        max_num_hands=2,
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5) as hands:
-    print("Press 'q' to quit.")
-
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            print("Failed to capture image.")
+if not args.headless:
+    cv2.setMouseCallback(window_name, button_clicked)
+
+print("Press 'q' to quit.")
+
+# Read the camera on its own thread and keep only the newest frame, so slow
+# frames never leave the camera buffer full of stale images (finite sources keep every frame)
+capture = LatestFrameCapture(cap).start()
+
+while not capture.finished:
+    item = capture.read()
+    if item is None:
+        # Keep the window responsive while waiting for the next frame
+        if not args.headless and cv2.waitKey(1) & 0xFF == ord('q'):
             break
+        continue
+    frame_id, captured_at, frame = item
+
+    try:
+        if cap.landmarks_only:
+            # Landmark replay skips MediaPipe; an all-zero frame means no hands in view
+            results = None
+            has_hands = bool(frame.any())
+            if has_hands:
+                np.copyto(frame_landmarks, frame)
+            image = np.zeros((window_height, window_width, 3), dtype=np.uint8)
+        else:
+            level = governor.level
+
+            # model_complexity is fixed per Hands instance, so switching levels rebuilds it
+            if level['model_complexity'] != hands_complexity:
+                if hands is not None:
+                    hands.close()
+                hands = mp_hands.Hands(
+                    max_num_hands=2,
+                    model_complexity=level['model_complexity'],
+                    min_detection_confidence=0.5,
+                    min_tracking_confidence=0.5)
+                hands_complexity = level['model_complexity']
 
-        try:
             # Flip the frame horizontally for a later selfie-view display
             frame = cv2.flip(frame, 1)
 
-            # Resize frame to match window size
-            frame = cv2.resize(frame, (window_width, window_height))
-
-            # Convert the BGR image to RGB
-            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Detect on the camera frame (downscaled by the governor), never on the upsized display
+            image_rgb = cv2.cvtColor(detection_input(frame, level['detection_width']), cv2.COLOR_BGR2RGB)
             image_rgb.flags.writeable = False  # Improve performance
 
             # Process the image and find hand landmarks
             results = hands.process(image_rgb)
 
-            # Set the flag to true to draw landmarks on the image
-            image_rgb.flags.writeable = True
-            image = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
-
-            if results.multi_hand_landmarks and results.multi_handedness:
-                # Prepare dictionaries to hold landmarks for left and right hands
-                hand_landmarks_dict = {'Left': None, 'Right': None}
-
-                # Loop through detected hands
-                for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                    # Get the handedness label
-                    hand_label = results.multi_handedness[idx].classification[0].label
-                    # Extract landmark coordinates
-                    landmarks = []
-                    for lm in hand_landmarks.landmark:
-                        landmarks.extend([lm.x, lm.y, lm.z])
-                    hand_landmarks_dict[hand_label] = landmarks
-
-                # Prepare combined landmarks for both hands
-                left_hand_landmarks = hand_landmarks_dict['Left'] or [0.0] * num_landmarks_per_hand
-                right_hand_landmarks = hand_landmarks_dict['Right'] or [0.0] * num_landmarks_per_hand
-                combined_landmarks = left_hand_landmarks + right_hand_landmarks
-
-                sequence.append(combined_landmarks)
-                sequence = sequence[-sequence_length:]  # Keep the last 'sequence_length' frames
-
-                # Draw hand landmarks on the image
+            # Resize frame to match window size; landmarks are normalized so they still line up
+            image = cv2.resize(frame, (window_width, window_height))
+
+            # Pack both hands into the preallocated (num_landmarks,) frame, zero-filling a missing hand
+            has_hands = extract_landmarks(results, frame_landmarks) is not None
+
+        if has_hands:
+            sequence.append(frame_landmarks)
+
+            # Draw hand landmarks on the image
+            if results is not None:
                 for hand_landmarks in results.multi_hand_landmarks:
                     mp.solutions.drawing_utils.draw_landmarks(
                         image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
-                # Perform prediction if we have enough frames
-                if len(sequence) == sequence_length:
-                    input_data = np.expand_dims(sequence, axis=0)
-                    input_data = np.array(input_data, dtype=np.float32)
+            # Perform prediction if we have enough frames
+            if sequence.is_full():
+                probabilities = runner.predict(sequence.window())[0]
+                prediction = np.argmax(probabilities)
+                confidence = probabilities[prediction]
+
+                if confidence > threshold:
+                    predicted_gesture = gestures[prediction]
+                    if predicted_gesture != last_prediction:
+                        sentence.append(predicted_gesture)
+                        last_prediction = predicted_gesture
+
+                        # Queue text-to-speech for the predicted gesture
+                        speech.say_word(predicted_gesture)
+
+                else:
+                    predicted_gesture = 'Unknown'
+
+                # Reset sequence after prediction
+                sequence.clear()
+        else:
+            # When no hands are detected, do nothing
+            pass
+
+        # Limit the sentence length
+        if len(sentence) > 7:
+            sentence = sentence[-7:]
+
+        # Check for key presses
+        key = cv2.waitKey(1) & 0xFF if not args.headless else -1
+
+        # Display the sentence on the image
+        if grammar_result:
+            # Display grammar corrected sentence
+            text_to_display = grammar_result
+        else:
+            # Display the current sentence
+            text_to_display = ' '.join(sentence)
+
+        # Draw the sentence centred on the image (re-rendered only when it changes)
+        sentence_layer.draw(image, text_to_display, (0, window_height - 30), center_width=window_width)
+
+        # Display the predicted gesture on the frame
+        if predicted_gesture and predicted_gesture != 'Unknown':
+            gesture_layer.draw(image, f'Gesture: {predicted_gesture}', (10, window_height - 70))
+
+        # Show save progress while the previous recording is being finished
+        if is_saving():
+            saving_layer.draw(image, f"Saving... {save_state['progress'] * 100:.0f}%", (10, window_height - 110))
+
+        # Draw buttons on the image with click effects
+        button_bar.draw(image, time.time())
+
+        # If recording and not paused, stream the frame to the encoder (audio records itself)
+        if is_recording and not is_paused:
+            # Record the frame's timestamp; the frame itself goes to the encoder
+            # (image is rebuilt every iteration and not drawn on after this point)
+            timestamp = time.time()
+            media_time = video_writer.write(image, timestamp)
+            recorded_frames.append({'timestamp': timestamp, 'media_time': media_time})
+
+        # Display the frame in the named window
+        if not args.headless:
+            cv2.imshow(window_name, image)
 
-                    probabilities = model.predict(input_data, verbose=0)[0]
-                    prediction = np.argmax(probabilities)
-                    confidence = probabilities[prediction]
-                    print(f"Predicted gesture: {gestures[prediction]}, Confidence: {confidence}")
+        # Capture -> display latency drives the quality level
+        governor.observe((time.perf_counter() - captured_at) * 1000.0)
 
-                    if confidence > threshold:
-                        predicted_gesture = gestures[prediction]
-                        if predicted_gesture != last_prediction:
-                            sentence.append(predicted_gesture)
-                            last_prediction = predicted_gesture
+        # Break the loop if 'q' is pressed
+        if key == ord('q'):
+            break
 
-                            # Add text-to-speech for the predicted gesture
-                            speak_text(predicted_gesture)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        traceback.print_exc()
+        break
 
-                    else:
-                        predicted_gesture = 'Unknown'
-
-                    # Reset sequence after prediction
-                    sequence = []
-            else:
-                # When no hands are detected, do nothing
-                pass
-
-            # Limit the sentence length
-            if len(sentence) > 7:
-                sentence = sentence[-7:]
-
-            # Check for key presses
-            key = cv2.waitKey(1) & 0xFF
-
-            # Display the sentence on the image
-            if grammar_result:
-                # Display grammar corrected sentence
-                text_to_display = grammar_result
-            else:
-                # Display the current sentence
-                text_to_display = ' '.join(sentence)
-
-            # Calculate text size and position
-            textsize = cv2.getTextSize(text_to_display, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)[0]
-            text_X_coord = (image.shape[1] - textsize[0]) // 2
-
-            # Draw the sentence on the image
-            cv2.putText(
-                image, text_to_display, (text_X_coord, window_height - 30),
-                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
-
-            # Display the predicted gesture on the frame
-            if predicted_gesture and predicted_gesture != 'Unknown':
-                cv2.putText(
-                    image, f'Gesture: {predicted_gesture}', (10, window_height - 70),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0),
-                    2, cv2.LINE_AA)
-
-            # Draw buttons on the image with click effects
-            draw_buttons(image)
-
-            # If recording and not paused, save the frame and collect audio
-            if is_recording and not is_paused:
-                # Record the frame with timestamp
-                recorded_frames.append({'frame': image.copy(), 'timestamp': time.time()})
-
-                # Collect audio data from the queue
-                while not audio_queue.empty():
-                    data = audio_queue.get()
-                    audio_data.append(data)
-
-            # Display the frame in the named window
-            cv2.imshow(window_name, image)
+capture.stop()
 
-            # Break the loop if 'q' is pressed
-            if key == ord('q'):
-                break
+# An unsaved recording is discarded, as before; a save in progress is allowed to finish
+if is_recording:
+    stop_audio_recording()
+    video_writer.abort()
+    audio_writer.abort()
+if is_saving():
+    print("Waiting for the recording to finish saving...")
+    save_state['thread'].join()
 
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            traceback.print_exc()
-            break
+if hands is not None:
+    hands.close()
+print(f"Capture: {capture.stats.throughput():.1f} frames/s, {capture.frames_skipped} stale frames skipped")
 
 cap.release()
-cv2.destroyAllWindows()
-tool.close()
-engine.stop()
+if not args.headless:
+    cv2.destroyAllWindows()
+print(f"Inference: {runner.summary()}")
+print(f"Quality: {governor.summary()}")
+speech.stop()
+print(f"Speech: {speech.summary()}")
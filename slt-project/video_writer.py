@@ -0,0 +1,202 @@
+# video_writer.py
+# Streams recorded frames to an encoder on a background thread while recording, so memory
+# stays bounded by a short frame queue instead of growing with the recording, and Save only
+# has to flush the last few queued frames. Frames are placed on a constant-rate timeline by
+# their timestamps: gaps (slow frames) repeat the previous frame and surplus frames are
+# skipped, so the video keeps real-time length. Time spent paused is cut from the timeline.
+#
+# Encodes through an ffmpeg pipe (libx264) when ffmpeg is on PATH or ships with moviepy
+# (imageio-ffmpeg), and through cv2.VideoWriter otherwise.
+
+import os
+import time
+import queue
+import shutil
+import threading
+import subprocess
+import cv2
+
+RECORD_FPS = 20
+QUEUE_FRAMES = 60         # Frames buffered for the encoder (~3 s at 20 fps, ~86 MB at 800x600)
+FFMPEG_PRESET = 'veryfast'
+CV2_FOURCC = 'mp4v'
+
+
+# Function to find an ffmpeg executable on PATH or the one bundled with moviepy, or None
+def find_ffmpeg():
+    path = shutil.which('ffmpeg')
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+# Encodes frames written from the render loop on its own thread
+class StreamingVideoWriter:
+    def __init__(self, path, frame_size, fps=RECORD_FPS, queue_frames=QUEUE_FRAMES, ffmpeg=None):
+        self.path = path
+        self.width, self.height = frame_size
+        self.fps = fps
+        self.ffmpeg = find_ffmpeg() if ffmpeg is None else ffmpeg
+        self.frames_received = 0
+        self.frames_processed = 0
+        self.frames_written = 0   # Output frames, including repeats that fill gaps
+        self.frames_dropped = 0   # Frames not queued because the encoder fell behind
+        self.paused = False
+        self.error = None
+        self._start_time = None
+        self._paused_at = None
+        self._paused_total = 0.0
+        self._queue = queue.Queue(maxsize=queue_frames)
+        self._closed = False
+        self._process = None
+        self._writer = None
+        self._open_encoder()
+        self._thread = threading.Thread(target=self._run, name='video-writer', daemon=True)
+        self._thread.start()
+
+    def _open_encoder(self):
+        if self.ffmpeg:
+            self._process = subprocess.Popen([
+                self.ffmpeg, '-y', '-loglevel', 'error',
+                '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{self.width}x{self.height}',
+                '-r', str(self.fps), '-i', '-',
+                '-an', '-c:v', 'libx264', '-preset', FFMPEG_PRESET, '-pix_fmt', 'yuv420p',
+                self.path
+            ], stdin=subprocess.PIPE)
+        else:
+            self._writer = cv2.VideoWriter(
+                self.path, cv2.VideoWriter_fourcc(*CV2_FOURCC), self.fps, (self.width, self.height))
+            if not self._writer.isOpened():
+                raise IOError(f"Cannot open a video writer for {self.path}")
+
+    @property
+    def backend(self):
+        return 'ffmpeg' if self._process is not None else 'cv2'
+
+    # Function to queue a (height, width, 3) BGR frame; the frame must not be modified afterwards
+    # Returns the frame's time on the recording timeline in seconds, or None if not recorded
+    def write(self, frame, timestamp=None):
+        if self._closed or self.paused:
+            return None
+        if timestamp is None:
+            timestamp = time.time()
+        if self._start_time is None:
+            self._start_time = timestamp
+        media_time = max(timestamp - self._start_time - self._paused_total, 0.0)
+        self.frames_received += 1
+        try:
+            self._queue.put_nowait((media_time, frame))
+        except queue.Full:
+            self.frames_dropped += 1  # The previous frame is repeated in its place
+        return media_time
+
+    def pause(self):
+        if not self.paused:
+            self.paused = True
+            self._paused_at = time.time()
+
+    def resume(self):
+        if self.paused:
+            self._paused_total += time.time() - self._paused_at
+            self.paused = False
+
+    # Function to get the recording timeline position (seconds) for a wall-clock time
+    def media_time(self, timestamp):
+        if self._start_time is None:
+            return 0.0
+        return max(timestamp - self._start_time - self._paused_total, 0.0)
+
+    def _encode(self, frame):
+        if self.error is not None:
+            return
+        try:
+            if frame.shape[1] != self.width or frame.shape[0] != self.height:
+                frame = cv2.resize(frame, (self.width, self.height))
+            if self._process is not None:
+                self._process.stdin.write(frame.tobytes())
+            else:
+                self._writer.write(frame)
+            self.frames_written += 1
+        except Exception as e:
+            self.error = e
+            print(f"Video encoder failed: {e}")
+
+    def _run(self):
+        last_frame = None
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            media_time, frame = item
+            index = int(media_time * self.fps)
+            # Repeat the previous frame over gaps so the timeline stays real-time
+            while last_frame is not None and self.frames_written < index and self.error is None:
+                self._encode(last_frame)
+            if self.frames_written <= index:
+                self._encode(frame)
+            last_frame = frame
+            self.frames_processed += 1
+
+    def _close_encoder(self):
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+            except Exception:
+                pass
+            if self._process.wait() != 0 and self.error is None:
+                self.error = RuntimeError(f"ffmpeg exited with code {self._process.returncode}")
+        elif self._writer is not None:
+            self._writer.release()
+
+    # Function to flush queued frames and close the file; `progress(fraction)` is called while
+    # the queue drains. Returns the video path, or None if encoding failed
+    def finish(self, progress=None):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        while self._thread.is_alive():
+            self._thread.join(timeout=0.1)
+            if progress is not None and self.frames_received:
+                progress((self.frames_processed + self.frames_dropped) / self.frames_received)
+        self._close_encoder()
+        if progress is not None:
+            progress(1.0)
+        return self.path if self.error is None and self.frames_written else None
+
+    # Function to stop without keeping the file
+    def abort(self):
+        self.finish()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def summary(self):
+        return (f"{self.backend}: {self.frames_received} frames in, {self.frames_written} written, "
+                f"{self.frames_dropped} dropped")
+
+
+# Function to combine an encoded video and a WAV file without re-encoding the video
+# `audio_offset` is when the audio starts relative to the first video frame, in seconds:
+# positive delays the audio, negative trims its start. Returns True on success
+def mux_audio(video_path, audio_path, output_path, ffmpeg=None, audio_offset=0.0):
+    ffmpeg = ffmpeg or find_ffmpeg()
+    if not ffmpeg:
+        print("ffmpeg not found; cannot add audio to the video.")
+        return False
+    if audio_offset >= 0:
+        align = ['-itsoffset', f'{audio_offset:.3f}']
+    else:
+        align = ['-ss', f'{-audio_offset:.3f}']
+    result = subprocess.run([
+        ffmpeg, '-y', '-loglevel', 'error',
+        '-i', video_path, *align, '-i', audio_path,
+        '-map', '0:v:0', '-map', '1:a:0', '-c:v', 'copy', '-c:a', 'aac', '-shortest',
+        output_path
+    ])
+    if result.returncode != 0:
+        print(f"ffmpeg failed to add audio (exit code {result.returncode}).")
+        return False
+    return True
@@ -0,0 +1,85 @@
+# window_utils.py
+# Desktop window helpers. tkinter and pywin32 are only imported when a window is actually
+# shown, so the scripts also run headless on machines without a display or on Linux.
+
+import time
+import cv2
+
+DEFAULT_SCREEN_SIZE = (1920, 1080)
+headless = False  # Set with set_headless(); dialogs then print instead of opening
+
+
+def set_headless(value=True):
+    global headless
+    headless = value
+
+
+# Function to get the screen size using tkinter, or a default if there is no display
+def screen_size():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        size = (root.winfo_screenwidth(), root.winfo_screenheight())
+        root.destroy()
+        return size
+    except Exception as e:
+        print(f"Could not read the screen size ({e}); assuming {DEFAULT_SCREEN_SIZE}.")
+        return DEFAULT_SCREEN_SIZE
+
+
+# Function to bring window to front (Windows only; a no-op elsewhere)
+def bring_window_to_front(window_title):
+    try:
+        import win32gui
+        import win32con
+    except ImportError:
+        return
+    try:
+        hwnd = win32gui.FindWindow(None, window_title)
+        if hwnd:
+            win32gui.ShowWindow(hwnd, win32con.SW_SHOW)
+            win32gui.SetForegroundWindow(hwnd)
+            win32gui.BringWindowToTop(hwnd)
+    except Exception as e:
+        print(f"Failed to bring window to front: {e}")
+
+
+# Function to create an OpenCV window of the given size, centred on the screen and in front
+def create_window(window_name, window_width=800, window_height=600):
+    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+    cv2.resizeWindow(window_name, window_width, window_height)
+
+    # Calculate top-left corner to center the window
+    screen_width, screen_height = screen_size()
+    x = (screen_width // 2) - (window_width // 2)
+    y = (screen_height // 2) - (window_height // 2)
+    cv2.moveWindow(window_name, x, y)
+
+    # Allow some time for the window to initialize
+    time.sleep(0.5)
+    bring_window_to_front(window_name)
+
+
+# Function to show an error dialog, or print it when headless / without a display
+def show_error(title, message):
+    _show('showerror', title, message)
+
+
+# Function to show an information dialog, or print it when headless / without a display
+def show_info(title, message):
+    _show('showinfo', title, message)
+
+
+def _show(kind, title, message):
+    if not headless:
+        try:
+            import tkinter as tk
+            from tkinter import messagebox
+            root = tk.Tk()
+            root.withdraw()  # Hide the root window
+            getattr(messagebox, kind)(title, message)
+            root.destroy()
+            return
+        except Exception as e:
+            print(f"Could not open a dialog ({e}).")
+    print(f"{title}: {message}")
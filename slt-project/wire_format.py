@@ -0,0 +1,84 @@
+# wire_format.py
+
+import io
+import numpy as np
+
+# Supported request/response content types
+JSON_MIMETYPE = 'application/json'
+OCTET_STREAM_MIMETYPE = 'application/octet-stream'
+NPY_MIMETYPES = ('application/x-npy', 'application/npy')
+
+# Raw octet-stream bodies describe their element type with these headers
+DTYPE_HEADER = 'X-Landmark-Dtype'   # float32 (default), float16 or int16
+SCALE_HEADER = 'X-Landmark-Scale'   # Fixed-point scale for int16 bodies
+DEFAULT_INT16_SCALE = 10000.0       # int16 value / scale = landmark coordinate (range about +/-3.27)
+
+RAW_DTYPES = {
+    'float32': np.dtype('<f4'),
+    'float16': np.dtype('<f2'),
+    'int16': np.dtype('<i2')
+}
+
+
+# Function to check whether a request body is in one of the binary formats
+def is_binary(mimetype):
+    return mimetype == OCTET_STREAM_MIMETYPE or mimetype in NPY_MIMETYPES
+
+
+# Function to check whether the client asked for a binary response
+def wants_binary(accept_mimetypes):
+    return accept_mimetypes.best_match([JSON_MIMETYPE, OCTET_STREAM_MIMETYPE]) == OCTET_STREAM_MIMETYPE
+
+
+# Function to decode a binary landmark body into a float32 array without copying where possible
+def decode_landmarks(body, mimetype, headers, frame_shape):
+    if mimetype in NPY_MIMETYPES:
+        return _decode_npy(body)
+
+    dtype_name = headers.get(DTYPE_HEADER, 'float32').lower()
+    if dtype_name not in RAW_DTYPES:
+        raise ValueError(f"Unsupported {DTYPE_HEADER} '{dtype_name}'. Expected one of {list(RAW_DTYPES)}")
+    dtype = RAW_DTYPES[dtype_name]
+    if len(body) % dtype.itemsize:
+        raise ValueError(f"Body size {len(body)} is not a multiple of the {dtype_name} element size")
+
+    # np.frombuffer views the request bytes directly; float32 needs no further conversion
+    values = np.frombuffer(body, dtype=dtype)
+    if dtype_name == 'int16':
+        scale = float(headers.get(SCALE_HEADER, DEFAULT_INT16_SCALE))
+        values = values.astype(np.float32) / np.float32(scale)
+    elif dtype_name == 'float16':
+        values = values.astype(np.float32)
+
+    # Shape the flat values as (N, sequence_length, num_landmarks) when they divide evenly
+    frame_size = int(np.prod(frame_shape))
+    if values.size and values.size % frame_size == 0:
+        return values.reshape((-1,) + tuple(frame_shape))
+    return values
+
+
+# Function to decode a .npy body, reading only its header and viewing the data in place
+def _decode_npy(body):
+    stream = io.BytesIO(body)
+    version = np.lib.format.read_magic(stream)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    if dtype.hasobject:
+        raise ValueError("Object arrays are not accepted")
+
+    values = np.frombuffer(body, dtype=dtype, offset=stream.tell(), count=int(np.prod(shape)))
+    values = values.reshape(shape, order='F' if fortran_order else 'C')
+    if values.dtype != np.float32:
+        values = values.astype(np.float32)
+    return values
+
+
+# Function to encode predictions as packed (int32 index, float32 confidence) records
+# Entries that could not be scored are sent as index -1 with a NaN confidence
+def encode_predictions(prediction_indices, confidences):
+    records = np.empty(len(prediction_indices), dtype=[('index', '<i4'), ('confidence', '<f4')])
+    records['index'] = prediction_indices
+    records['confidence'] = confidences
+    return records.tobytes()